@@ -4,11 +4,9 @@ HyperLiquid AI Trading Bot - Main Entry Point
 """
 import sys
 import argparse
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+# Run from the repository root: the script's directory is already on
+# sys.path, and src/ resolves its own modules through package imports
 from src.trading_bot import TradingBot
 from src.utils.logger import get_logger
 
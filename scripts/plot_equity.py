@@ -3,130 +3,197 @@ Real-time equity curve viewer.
 Run: python scripts/plot_equity.py
 Requires matplotlib (installed via requirements).
 """
-import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import matplotlib.pyplot as plt
 import pandas as pd
-from matplotlib import dates as mdates
 import numpy as np
 
-try:
-    import mplcursors  # type: ignore
-except ImportError:  # pragma: no cover
-    mplcursors = None
+# matplotlib (and mplcursors) are imported where the chart is built, so
+# importing load_equity alone does not pay for pyplot and a GUI backend
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 EQUITY_LOG = PROJECT_ROOT / "logs" / "equity_history.csv"
 REFRESH_SECONDS = 30
+# Only the columns the chart shows, with fixed dtypes so nothing is inferred;
+# Int32 is nullable so a half-written last row still parses
+EQUITY_DTYPES = {"capital": "float64", "unrealized_pnl": "float64", "num_positions": "Int32"}
+EQUITY_COLUMNS = ["timestamp", *EQUITY_DTYPES]
+
+
+def _read_equity(skip_rows: int = 0) -> pd.DataFrame:
+    """Parse EQUITY_LOG after its first skip_rows data rows."""
+    return pd.read_csv(
+        EQUITY_LOG,
+        engine="c",
+        usecols=EQUITY_COLUMNS,
+        dtype=EQUITY_DTYPES,
+        parse_dates=["timestamp"],
+        date_format="ISO8601",
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+    )
+
+
+# Rows already parsed from EQUITY_LOG; each refresh only reads what was appended
+_equity_cache = {"mtime": None, "size": 0, "rows": 0, "df": None}
 
 
 def load_equity() -> Optional[pd.DataFrame]:
-    """Load equity history if it exists."""
+    """Load equity history if it exists, parsing only rows added since the last call."""
     if not EQUITY_LOG.exists():
         return None
-    df = pd.read_csv(EQUITY_LOG, parse_dates=["timestamp"])
-    if df.empty:
-        return None
-    df.sort_values("timestamp", inplace=True)
-    df.reset_index(drop=True, inplace=True)
-    return df
+    stat = EQUITY_LOG.stat()
+    cache = _equity_cache
+    if stat.st_mtime == cache["mtime"] and stat.st_size == cache["size"]:
+        return cache["df"]
+
+    cached = cache["df"]
+    if cached is not None and stat.st_size >= cache["size"]:
+        # Append-only log: skip the rows we already have (keep the header)
+        new = _read_equity(cache["rows"])
+    else:
+        # First load, or the bot reset the log on startup
+        cached = None
+        new = _read_equity()
+    # A row still being written shows up with missing fields; read it next time
+    if len(new) and new.iloc[-1].isna().any():
+        new = new.iloc[:-1]
+    rows = (cache["rows"] if cached is not None else 0) + len(new)
+
+    if cached is None:
+        df = new
+    elif new.empty:
+        df = cached
+    else:
+        df = pd.concat([cached, new], ignore_index=True)
+    if not df.empty and not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp", ignore_index=True)
+
+    cache.update(mtime=stat.st_mtime, size=stat.st_size, rows=rows, df=df if not df.empty else None)
+    return cache["df"]
+
+
+def _attach_cursor(ax: "Axes", line) -> None:
+    """Show the timestamp and capital of the hovered point, if mplcursors is installed."""
+    try:
+        import mplcursors  # type: ignore
+    except ImportError:  # pragma: no cover
+        return
+    cursor = mplcursors.cursor(line, hover=True)
+
+    @cursor.connect("add")
+    def _on_add(sel):
+        # Read the arrays at event time so the cursor follows every refresh
+        timestamps, capital, x_data = ax._equity_data
+        idx = getattr(sel, "index", None)
+        if idx is None:
+            target_x = sel.target[0]
+            idx = int(np.abs(x_data - target_x).argmin())
+        idx = max(0, min(len(capital) - 1, int(idx)))
+        timestamp = pd.Timestamp(timestamps[idx])
+        sel.annotation.set_text(
+            f"{timestamp:%Y-%m-%d %H:%M:%S}\nCapital: ${capital[idx]:,.2f}"
+        )
+
+    ax._cursor = cursor
 
 
-def update_chart(ax: plt.Axes) -> None:
-    """Reload data from CSV and redraw the equity curve."""
+def update_chart(ax: "Axes") -> bool:
+    """Reload data from CSV and update the equity curve in place.
+
+    Returns True if the axes changed and the figure needs redrawing.
+    """
+    from matplotlib import dates as mdates
+
     df = load_equity()
-    ax.clear()
+    line = getattr(ax, "_equity_line", None)
 
     if df is None:
-        ax.set_title("Waiting for equity data…")
+        if line is None:
+            ax.set_title("Waiting for equity data…")
+            ax.set_xlabel("Time")
+            ax.set_ylabel("Capital (USD)")
+            return True
+        return False
+    if df is getattr(ax, "_equity_df", None):
+        # Nothing new since the last draw
+        return False
+    ax._equity_df = df
+
+    # Plot and annotate from plain arrays instead of indexing the frame
+    timestamps = df["timestamp"].to_numpy()
+    capital = df["capital"].to_numpy(dtype=np.float64)
+    ax._equity_data = (timestamps, capital, mdates.date2num(timestamps))
+
+    if line is None:
+        # Artists, labels and the hover cursor are created once
+        line, = ax.plot(timestamps, capital, label="Capital", color="#1f77b4")
+        ax._equity_line = line
+        ax.set_title("AITrading Equity Curve")
         ax.set_xlabel("Time")
         ax.set_ylabel("Capital (USD)")
-        return
-
-    line, = ax.plot(df["timestamp"], df["capital"], label="Capital", color="#1f77b4")
-    ax.fill_between(df["timestamp"], df["capital"], alpha=0.1, color="#1f77b4")
-    ax.set_title("AITrading Equity Curve")
-    ax.set_xlabel("Time")
-    ax.set_ylabel("Capital (USD)")
-    ax.grid(True, linestyle="--", alpha=0.3)
-    ax.legend(loc="best")
-    ax.tick_params(axis="x", rotation=30)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d\n%H:%M"))
-
-    latest_time = df["timestamp"].iloc[-1]
-    latest_capital = df["capital"].iloc[-1]
-    latest_unrealized = df["unrealized"].iloc[-1] if "unrealized" in df.columns else 0.0
-    latest_positions = df["num_positions"].iloc[-1] if "num_positions" in df.columns else 0
-    info = (
+        ax.grid(True, linestyle="--", alpha=0.3)
+        ax.legend(loc="best")
+        ax.tick_params(axis="x", rotation=30)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d\n%H:%M"))
+        ax._latest_label = ax.text(
+            0.02,
+            0.95,
+            "",
+            transform=ax.transAxes,
+            fontsize=10,
+            verticalalignment="top",
+            bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.7),
+        )
+        _attach_cursor(ax, line)
+    else:
+        line.set_data(timestamps, capital)
+
+    # The shaded area has no set_data; replace it
+    prior_fill = getattr(ax, "_equity_fill", None)
+    if prior_fill is not None:
+        prior_fill.remove()
+    ax._equity_fill = ax.fill_between(timestamps, capital, alpha=0.1, color="#1f77b4")
+    ax.relim()
+    ax.autoscale_view()
+
+    latest_time = pd.Timestamp(timestamps[-1])
+    latest_capital = capital[-1]
+    latest_unrealized = df["unrealized_pnl"].iloc[-1]
+    latest_positions = df["num_positions"].iloc[-1]
+    ax._latest_label.set_text(
         f"Latest capital: ${latest_capital:,.2f}\n"
         f"Unrealized PnL: ${latest_unrealized:,.2f}\n"
         f"Open positions: {latest_positions}\n"
         f"Updated: {latest_time:%Y-%m-%d %H:%M:%S}"
     )
-
-    prior_text = getattr(ax, "_latest_label", None)
-    if prior_text is not None:
-        try:
-            prior_text.remove()
-        except NotImplementedError:
-            prior_text.set_visible(False)
-    ax._latest_label = ax.text(
-        0.02,
-        0.95,
-        info,
-        transform=ax.transAxes,
-        fontsize=10,
-        verticalalignment="top",
-        bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.7),
-    )
-
-    if mplcursors:
-        prior_cursor = getattr(ax, "_cursor", None)
-        if prior_cursor is not None:
-            try:
-                prior_cursor.remove()
-            except NotImplementedError:
-                prior_cursor.enabled = False
-
-        cursor = mplcursors.cursor(line, hover=True)
-        x_data = line.get_xdata()
-
-        @cursor.connect("add")
-        def _on_add(sel):
-            idx = getattr(sel, "index", None)
-            if idx is None:
-                target_x = sel.target[0]
-                # Ensure numpy array for subtraction
-                idx = int(np.abs(x_data - target_x).argmin())
-            idx = max(0, min(len(df) - 1, int(idx)))
-            timestamp = df["timestamp"].iloc[idx]
-            capital = df["capital"].iloc[idx]
-            sel.annotation.set_text(
-                f"{timestamp:%Y-%m-%d %H:%M:%S}\nCapital: ${capital:,.2f}"
-            )
-
-        ax._cursor = cursor
+    return True
 
 
 def main() -> None:
+    import matplotlib.pyplot as plt
+
     plt.style.use("seaborn-v0_8")
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    def refresh(_frame):
-        update_chart(ax)
+    def refresh():
+        # load_equity stats the file first, so an idle log costs one stat()
+        # and no redraw
+        if update_chart(ax):
+            fig.canvas.draw_idle()
 
     # Initial draw
     update_chart(ax)
     plt.tight_layout()
 
-    # Manual refresh loop (no animation to keep deps minimal)
-    while True:
-        plt.pause(0.1)
-        refresh(None)
-        plt.draw()
-        plt.pause(REFRESH_SECONDS)
+    # A GUI-loop timer rather than FuncAnimation, which redraws every frame
+    # even when nothing changed; plt.show() blocks until the window closes
+    timer = fig.canvas.new_timer(interval=REFRESH_SECONDS * 1000)
+    timer.add_callback(refresh)
+    timer.start()
+    plt.show()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,113 @@
 """
 Deepseek AI Agent for trading decisions
 """
-import json
+import asyncio
+import copy
+import math
+import re
+import time
+from collections import deque
+from types import MappingProxyType
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from openai import OpenAI
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
 
 from ..utils.logger import get_logger
 from ..utils.config_loader import get_config
+from ..utils.http_client import create_async_http_client, create_http_client
+from ..utils.cache import TTLCache, prompt_key
+from ..utils import json_utils
+
+# Actions the system prompt allows; anything else is treated as hold
+DECISION_ACTIONS = frozenset(("buy", "sell", "hold"))
+# Read-only template for the hold returned when an analysis fails
+SAFE_HOLD = MappingProxyType({'action': 'hold', 'confidence': 0})
+
+# The fields AITradingStrategy acts on. The schema lists them first, so a
+# streamed reply can be cut off once they are complete; everything after
+# them (prices the risk manager recomputes, reasoning) is only logged
+EARLY_DECISION_FIELDS = {
+    name: re.compile(rf'"{name}"\s*:\s*"?([\w.+-]+)"?\s*[,}}]')
+    for name in ("action", "confidence", "leverage")
+}
+
+# System prompts are constants so every request sends byte-identical
+# prefixes, which Deepseek can serve from its prompt prefix cache
+SYSTEM_PROMPT = """You are an expert cryptocurrency trading analyst and advisor. Your role is to analyze market data, technical indicators, and provide clear trading recommendations.
+
+Your analysis should consider:
+1. Technical indicators (RSI, MACD, Moving Averages, Bollinger Bands)
+2. Price trends and momentum
+3. Volume analysis
+4. Market sentiment
+5. Risk management principles
+
+Provide your recommendation in the following JSON format:
+{
+    "action": "buy" | "sell" | "hold",
+    "confidence": 0.0 to 1.0,
+    "leverage": 1 to 5,
+    "entry_price": number,
+    "stop_loss": number,
+    "take_profit": number,
+    "reasoning": "detailed explanation of your decision"
+}
+
+Be conservative and prioritize capital preservation. Only recommend trades with high confidence when the setup is clear.
+
+Respond with ONLY the JSON object, no other text."""
+OPTIMIZER_SYSTEM_PROMPT = "You are an expert in quantitative trading strategy optimization."
+
+# Per-call analysis prompt. The stable instruction comes before the numbers,
+# so consecutive prompts share the longest possible prefix
+ANALYSIS_PROMPT_TEMPLATE = """Based on the market data below, should I BUY, SELL, or HOLD? Provide your recommendation in the specified JSON format with detailed reasoning.
+
+## Current Market Data for {coin}
+- Current Price: ${price:.2f}
+- 24h Volume: {volume:.2f}
+
+## Technical Indicators
+- SMA (20): ${sma:.2f}
+- EMA (12): ${ema:.2f}
+- RSI (14): {rsi:.2f} ({rsi_signal})
+- MACD: {macd:.4f}
+- MACD Signal: {macd_signal:.4f}
+- MACD Trend: {macd_trend}
+- Bollinger Upper: ${bb_upper:.2f}
+- Bollinger Lower: ${bb_lower:.2f}
+- ATR: ${atr:.2f}
+- Overall Trend: {trend}
+
+## Current Position
+{position_section}
+"""
+POSITION_SECTION_TEMPLATE = """- Side: {side}
+- Size: {size:.4f}
+- Entry Price: ${entry_price:.2f}
+- Leverage: {leverage:.2f}x
+- Unrealized PnL: {pnl_pct:.2f}%"""
+NO_POSITION_SECTION = "- No open position"
+
+# Prompt values are snapped to these steps so tick-to-tick jitter does not
+# change the prompt bytes: price-level fields (and MACD) to the power of ten
+# at or below this fraction of the current price, 24h volume likewise
+# relative to itself, RSI to whole points
+PRICE_STEP_FRACTION = 1e-4
+MACD_STEP_FRACTION = 1e-5
+VOLUME_STEP_FRACTION = 1e-2
+RSI_STEP = 1.0
+
+# Indicator values the prompt falls back to, merged under the caller's
+# indicators once per prompt instead of one .get() default per field
+INDICATOR_DEFAULTS = MappingProxyType({
+    'sma': 0, 'ema': 0, 'rsi': 0, 'macd': 0, 'macd_signal': 0,
+    'bb_upper': 0, 'bb_lower': 0, 'atr': 0,
+    'rsi_signal': 'neutral', 'trend': 'neutral',
+})
+# Indicators quantized with the price-level step
+PRICE_LEVEL_INDICATORS = ('sma', 'ema', 'bb_upper', 'bb_lower', 'atr')
 
 
 class DeepseekAgent:
@@ -32,16 +131,75 @@ class DeepseekAgent:
         self.model = config.get('model', 'deepseek-chat')
         self.max_tokens = config.get('max_tokens', 2000)
         self.temperature = config.get('temperature', 0.7)
+        # Ask for a bare JSON object (response_format json_object) so replies
+        # parse directly instead of being extracted from prose or fences
+        self.json_mode = config.get('json_mode', True)
+        # Stream replies and stop reading once the decision fields are in
+        self.stream = config.get('stream', True)
+        
+        # Keyword arguments shared by every analysis request
+        self._request_options: Dict[str, Any] = {
+            'model': self.model,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+        }
+        if self.json_mode:
+            self._request_options['response_format'] = {'type': 'json_object'}
+        # Replies that had to be read as text; should stay at 0 in JSON mode
+        self.text_fallbacks = 0
+        # Prompt tokens served from / missing Deepseek's prefix cache
+        self.prompt_cache_hit_tokens = 0
+        self.prompt_cache_miss_tokens = 0
+        
+        # System messages built once and shared by every request
+        self._system_message = {"role": "system", "content": SYSTEM_PROMPT}
+        self._optimizer_system_message = {"role": "system", "content": OPTIMIZER_SYSTEM_PROMPT}
+        
+        # Identical prompts (same coin, same rounded market data and position)
+        # reuse the last decision until the TTL expires (0 disables the cache)
+        decision_cache_ttl = config.get('decision_cache_ttl', 600)
+        self.decision_cache = (
+            TTLCache(maxsize=config.get('decision_cache_size', 32), ttl=decision_cache_ttl)
+            if decision_cache_ttl > 0 else None
+        )
+        # Optional second tier: reuse a coin's last decision while its market
+        # state stays within this tolerance of the one it was made for
+        # (fractions of price, RSI/100, PnL/100; 0 disables)
+        self.similar_state_tolerance = config.get('similar_state_tolerance', 0.0)
+        self._last_states: Dict[str, tuple] = {}
         
         # Dialog log file shared across components
         project_root = Path(__file__).parent.parent.parent
         self.dialog_log_path = project_root / "logs" / "ai_dialogs.log"
         self.dialog_log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Initialize OpenAI client (Deepseek is OpenAI-compatible)
+        # Max in-flight requests in analyze_markets
+        self.max_concurrent_requests = config.get('max_concurrent_requests', 8)
+        # Per-request timeout and SDK retry budget: the SDK backs off
+        # exponentially on 429s (honoring retry-after), timeouts and 5xx
+        self.request_timeout = config.get('request_timeout', 30.0)
+        self.max_retries = config.get('max_retries', 2)
+        # Circuit breaker: after this many failed analyses within the window
+        # (seconds), calls return a hold at once instead of waiting out the
+        # timeout; once the oldest failure ages out, one call probes again
+        self.circuit_breaker_failures = config.get('circuit_breaker_failures', 5)
+        self.circuit_breaker_window = config.get('circuit_breaker_window', 60.0)
+        self._failure_times: deque = deque(maxlen=max(1, self.circuit_breaker_failures))
+        
+        # Initialize OpenAI client (Deepseek is OpenAI-compatible) over a
+        # pooled keep-alive (HTTP/2 when available) connection; the pool uses
+        # the same max_concurrent_requests bound as the async clients that
+        # analyze_markets/analyze_pipeline open
+        self.http_client = create_http_client(
+            timeout=self.request_timeout,
+            max_connections=self.max_concurrent_requests
+        )
         self.client = OpenAI(
             api_key=self.api_key,
-            base_url=self.api_url
+            base_url=self.api_url,
+            http_client=self.http_client,
+            timeout=self.request_timeout,
+            max_retries=self.max_retries
         )
         
         self.logger.info(f"DeepseekAgent initialized with model: {self.model}")
@@ -70,73 +228,392 @@ class DeepseekAgent:
             prompt = self._build_analysis_prompt(
                 coin, market_data, technical_indicators, current_position
             )
+            state = self._market_state(market_data, technical_indicators, current_position)
+            cached = self._cached_decision(coin, prompt, state)
+            if cached is not None:
+                return cached
+            if self._circuit_open():
+                return self._circuit_open_decision(coin)
             
             # Call Deepseek API
+            if self.stream:
+                decision_text, fields = self._stream_decision(prompt)
+                return self._handle_decision(coin, prompt, decision_text, state, fields)
+            
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens
+                messages=self._build_messages(prompt),
+                **self._request_options
             )
             
-            # Parse response
-            decision_text = response.choices[0].message.content
-            decision = self._parse_decision(decision_text)
-            confidence = self._safe_float(decision.get('confidence', 0))
+            self._record_cache_usage(response.usage)
+            return self._handle_decision(coin, prompt, response.choices[0].message.content, state)
             
-            self._log_dialog(
-                coin=coin,
-                prompt=prompt,
-                response_text=decision_text,
+        except Exception as e:
+            self._failure_times.append(time.monotonic())
+            return self._error_decision(e)
+    
+    async def aanalyze_market(
+        self,
+        coin: str,
+        market_data: Dict[str, Any],
+        technical_indicators: Dict[str, Any],
+        current_position: Optional[Dict[str, Any]] = None,
+        client: Optional[AsyncOpenAI] = None
+    ) -> Dict[str, Any]:
+        """
+        Async analyze_market, so several coins' requests can overlap
+        
+        Args:
+            coin: Coin symbol
+            market_data: Market data including price, volume, etc.
+            technical_indicators: Technical indicators (RSI, MACD, etc.)
+            current_position: Current position if any
+            client: Async client to share across a batch; one is opened for
+                this call when omitted
+        
+        Returns:
+            Trading decision with action, confidence, and reasoning
+        """
+        if client is None:
+            async with self._create_async_client() as client:
+                return await self.aanalyze_market(
+                    coin, market_data, technical_indicators, current_position, client
+                )
+        
+        try:
+            prompt = self._build_analysis_prompt(
+                coin, market_data, technical_indicators, current_position
             )
+            state = self._market_state(market_data, technical_indicators, current_position)
+            cached = self._cached_decision(coin, prompt, state)
+            if cached is not None:
+                return cached
+            if self._circuit_open():
+                return self._circuit_open_decision(coin)
             
-            self.logger.info(
-                f"AI decision for {coin}: {decision.get('action', 'HOLD')} "
-                f"(confidence: {confidence:.2f})"
+            if self.stream:
+                decision_text, fields = await self._astream_decision(client, prompt)
+                return self._handle_decision(coin, prompt, decision_text, state, fields)
+            
+            response = await client.chat.completions.create(
+                messages=self._build_messages(prompt),
+                **self._request_options
             )
             
-            return decision
+            self._record_cache_usage(response.usage)
+            return self._handle_decision(coin, prompt, response.choices[0].message.content, state)
             
         except Exception as e:
-            self.logger.error(f"Error in AI analysis: {e}")
-            return {
-                'action': 'hold',
-                'confidence': 0,
-                'reasoning': f'Error: {str(e)}'
+            self._failure_times.append(time.monotonic())
+            return self._error_decision(e)
+    
+    async def analyze_pipeline(
+        self,
+        coin: str,
+        fetch_market: Callable[[str], Awaitable[Dict[str, Any]]],
+        fetch_indicators: Callable[[str], Awaitable[Dict[str, Any]]],
+        current_position: Optional[Dict[str, Any]] = None,
+        client: Optional[AsyncOpenAI] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch a coin's market data and indicators concurrently, then analyze them
+        
+        Args:
+            coin: Coin symbol
+            fetch_market: Coroutine function returning the coin's market data
+            fetch_indicators: Coroutine function returning its technical indicators
+            current_position: Current position if any
+            client: Async client to share across a batch
+        
+        Returns:
+            Trading decision (a hold if either fetch fails)
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                market_task = group.create_task(fetch_market(coin))
+                indicators_task = group.create_task(fetch_indicators(coin))
+        except ExceptionGroup as e:
+            # Report the first failed fetch rather than the group wrapper
+            return self._error_decision(e.exceptions[0])
+        
+        return await self.aanalyze_market(
+            coin, market_task.result(), indicators_task.result(), current_position, client
+        )
+    
+    def analyze_markets(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze several coins concurrently over one async client
+        
+        Args:
+            requests: analyze_market keyword arguments, one dict per coin
+        
+        Returns:
+            Trading decisions in request order
+        """
+        return asyncio.run(self._analyze_markets(requests))
+    
+    async def _analyze_markets(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fan the requests out over one client scoped to this event loop"""
+        # Bounded so a large scan cannot burst past Deepseek's rate limits
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        async with self._create_async_client() as client:
+            async def analyze(request: Dict[str, Any]) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.aanalyze_market(client=client, **request)
+            
+            return await asyncio.gather(*(analyze(request) for request in requests))
+    
+    def _stream_decision(self, prompt: str) -> Tuple[str, Optional[Dict[str, str]]]:
+        """
+        Stream a reply, closing the connection as soon as the decision fields arrive
+        
+        Prefix-cache usage is sent in the stream's final chunk, so it is only
+        recorded for replies read to the end (no early exit).
+        
+        Returns:
+            Text received, and the decision fields if the reply was cut short
+        """
+        stream = self.client.chat.completions.create(
+            messages=self._build_messages(prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._request_options
+        )
+        text = ""
+        try:
+            for chunk in stream:
+                usage = getattr(chunk, 'usage', None)
+                if usage is not None:
+                    self._record_cache_usage(usage)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                text += delta
+                fields = self._early_decision_fields(text, delta)
+                if fields is not None:
+                    return text, fields
+        finally:
+            stream.close()
+        return text, None
+    
+    async def _astream_decision(
+        self,
+        client: AsyncOpenAI,
+        prompt: str
+    ) -> Tuple[str, Optional[Dict[str, str]]]:
+        """Async _stream_decision"""
+        stream = await client.chat.completions.create(
+            messages=self._build_messages(prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._request_options
+        )
+        text = ""
+        try:
+            async for chunk in stream:
+                usage = getattr(chunk, 'usage', None)
+                if usage is not None:
+                    self._record_cache_usage(usage)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                text += delta
+                fields = self._early_decision_fields(text, delta)
+                if fields is not None:
+                    return text, fields
+        finally:
+            await stream.close()
+        return text, None
+    
+    @staticmethod
+    def _early_decision_fields(text: str, delta: str) -> Optional[Dict[str, str]]:
+        """Decision fields once all are complete in the streamed text, else None"""
+        # A field value can only complete on a delimiter
+        if "," not in delta and "}" not in delta:
+            return None
+        fields = {}
+        for name, pattern in EARLY_DECISION_FIELDS.items():
+            match = pattern.search(text)
+            if match is None:
+                return None
+            fields[name] = match.group(1)
+        return fields
+    
+    def _record_cache_usage(self, usage: Any) -> None:
+        """Accumulate how much of each prompt Deepseek served from its prefix cache"""
+        hit_tokens = getattr(usage, 'prompt_cache_hit_tokens', None)
+        if hit_tokens is None:
+            return
+        self.prompt_cache_hit_tokens += hit_tokens
+        self.prompt_cache_miss_tokens += getattr(usage, 'prompt_cache_miss_tokens', 0)
+        self.logger.debug(
+            "Prompt cache: %.0f%% of prompt tokens hit so far", self.prompt_cache_hit_rate * 100
+        )
+    
+    @property
+    def prompt_cache_hit_rate(self) -> float:
+        """
+        Fraction of prompt tokens served from Deepseek's prefix cache
+        
+        Covers non-streamed replies and streamed replies read to the end;
+        streams closed early at the decision fields never receive usage.
+        """
+        total = self.prompt_cache_hit_tokens + self.prompt_cache_miss_tokens
+        return self.prompt_cache_hit_tokens / total if total else 0.0
+    
+    def _create_async_client(self) -> AsyncOpenAI:
+        """Async client with its own connection pool (bound to the running event loop)"""
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url,
+            http_client=create_async_http_client(
+                timeout=self.request_timeout,
+                max_connections=self.max_concurrent_requests
+            ),
+            timeout=self.request_timeout,
+            max_retries=self.max_retries
+        )
+    
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for an analysis prompt"""
+        return [
+            self._system_message,
+            {
+                "role": "user",
+                "content": prompt
             }
+        ]
+    
+    def _market_state(
+        self,
+        market_data: Dict[str, Any],
+        technical_indicators: Dict[str, Any],
+        current_position: Optional[Dict[str, Any]]
+    ) -> Optional[np.ndarray]:
+        """
+        Scale-free feature vector used to spot near-identical market states
+        
+        Price-based indicators are expressed relative to the current price,
+        so one tolerance fits every coin. Position side is encoded as a full
+        unit so states with a different position never match.
+        """
+        if self.similar_state_tolerance <= 0:
+            return None
+        price = self._safe_float(market_data.get('price', 0))
+        if price <= 0:
+            return None
+        get = technical_indicators.get
+        relative = [
+            self._safe_float(get(name, 0)) / price
+            for name in ('sma', 'ema', 'bb_upper', 'bb_lower')
+        ]
+        side = 0.0
+        pnl_pct = 0.0
+        if current_position:
+            side = 1.0 if current_position.get('is_long') else -1.0
+            pnl_pct = self._safe_float(self._calculate_pnl(current_position, price))
+        return np.array([
+            *relative,
+            self._safe_float(get('macd', 0)) / price,
+            self._safe_float(get('macd_signal', 0)) / price,
+            self._safe_float(get('atr', 0)) / price,
+            self._safe_float(get('rsi', 0)) / 100,
+            pnl_pct / 100,
+            side,
+        ])
+    
+    def _cached_decision(
+        self,
+        coin: str,
+        prompt: str,
+        state: Optional[np.ndarray] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Copy of the cached decision for this prompt or a near-identical state, or None"""
+        if self.decision_cache is None:
+            return None
+        # The prompt embeds the coin and its values at fixed precision, so
+        # it already is the canonical form of the inputs
+        decision = self.decision_cache.get(prompt_key(prompt))
+        if decision is not None:
+            self.logger.info(
+                "%s: market unchanged, reusing cached AI decision (cache hit rate %.0f%%)",
+                coin, self.decision_cache.hit_rate * 100
+            )
+            return copy.deepcopy(decision)
+        
+        last = self._last_states.get(coin)
+        if state is None or last is None:
+            return None
+        last_state, decision, stored_at = last
+        if time.monotonic() - stored_at >= self.decision_cache.ttl:
+            del self._last_states[coin]
+            return None
+        if np.abs(state - last_state).max() > self.similar_state_tolerance:
+            return None
+        self.logger.info("%s: market state within tolerance, reusing last AI decision", coin)
+        return copy.deepcopy(decision)
+    
+    def _handle_decision(
+        self,
+        coin: str,
+        prompt: str,
+        decision_text: str,
+        state: Optional[np.ndarray] = None,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Parse, log, cache and return the decision from a reply (or its early fields)"""
+        # A reply closes the circuit
+        self._failure_times.clear()
+        if fields is not None:
+            decision = self._normalize_decision(
+                dict(fields, reasoning="(reply cut off after the decision fields)")
+            )
+        else:
+            decision = self._parse_decision(decision_text)
+        confidence = self._safe_float(decision.get('confidence', 0))
+        if self.decision_cache is not None:
+            self.decision_cache.set(prompt_key(prompt), copy.deepcopy(decision))
+            if state is not None:
+                self._last_states[coin] = (state, copy.deepcopy(decision), time.monotonic())
+        
+        self._log_dialog(
+            coin=coin,
+            prompt=prompt,
+            response_text=decision_text,
+        )
+        
+        self.logger.info(
+            f"AI decision for {coin}: {decision.get('action', 'HOLD')} "
+            f"(confidence: {confidence:.2f})"
+        )
+        
+        return decision
+    
+    def _circuit_open(self) -> bool:
+        """Whether recent failures should short-circuit the next API call"""
+        failures = self._failure_times
+        return (
+            self.circuit_breaker_failures > 0
+            and len(failures) == failures.maxlen
+            and time.monotonic() - failures[0] < self.circuit_breaker_window
+        )
+    
+    def _circuit_open_decision(self, coin: str) -> Dict[str, Any]:
+        """Hold returned without calling the API while the circuit is open"""
+        self.logger.warning(
+            "%s: skipping AI analysis after %d recent failures", coin, len(self._failure_times)
+        )
+        return {**SAFE_HOLD, 'reasoning': 'AI analysis paused after repeated failures'}
+    
+    def _error_decision(self, error: Exception) -> Dict[str, Any]:
+        """Hold decision returned when an analysis fails"""
+        self.logger.error(f"Error in AI analysis: {error}")
+        return {**SAFE_HOLD, 'reasoning': f'Error: {error}'}
     
     def _get_system_prompt(self) -> str:
         """Get system prompt for the AI agent"""
-        return """You are an expert cryptocurrency trading analyst and advisor. Your role is to analyze market data, technical indicators, and provide clear trading recommendations.
-
-Your analysis should consider:
-1. Technical indicators (RSI, MACD, Moving Averages, Bollinger Bands)
-2. Price trends and momentum
-3. Volume analysis
-4. Market sentiment
-5. Risk management principles
-
-Provide your recommendation in the following JSON format:
-{
-    "action": "buy" | "sell" | "hold",
-    "confidence": 0.0 to 1.0,
-    "leverage": 1 to 5,
-    "entry_price": number,
-    "stop_loss": number,
-    "take_profit": number,
-    "reasoning": "detailed explanation of your decision"
-}
-
-Be conservative and prioritize capital preservation. Only recommend trades with high confidence when the setup is clear."""
+        return SYSTEM_PROMPT
     
     def _build_analysis_prompt(
         self,
@@ -148,59 +625,44 @@ Be conservative and prioritize capital preservation. Only recommend trades with
         """Build analysis prompt from market data"""
         
         price = self._safe_float(market_data.get('price', 0))
-        volume = self._safe_float(market_data.get('volume', 0))
-        sma = self._safe_float(technical_indicators.get('sma', 0))
-        ema = self._safe_float(technical_indicators.get('ema', 0))
-        rsi = self._safe_float(technical_indicators.get('rsi', 0))
-        macd = self._safe_float(technical_indicators.get('macd', 0))
-        macd_signal = self._safe_float(technical_indicators.get('macd_signal', 0))
-        bb_upper = self._safe_float(technical_indicators.get('bb_upper', 0))
-        bb_lower = self._safe_float(technical_indicators.get('bb_lower', 0))
-        atr = self._safe_float(technical_indicators.get('atr', 0))
-        rsi_signal = technical_indicators.get('rsi_signal', 'neutral')
-        macd_trend = technical_indicators.get('macd_signal', 'neutral')
-        trend = technical_indicators.get('trend', 'neutral')
-
-        prompt = f"""Analyze the following market data for {coin} and provide a trading recommendation:
-
-## Current Market Data
-- Current Price: ${price:.2f}
-- 24h Volume: {volume:.2f}
-
-## Technical Indicators
-- SMA (20): ${sma:.2f}
-- EMA (12): ${ema:.2f}
-- RSI (14): {rsi:.2f} ({rsi_signal})
-- MACD: {macd:.4f}
-- MACD Signal: {macd_signal:.4f}
-- MACD Trend: {macd_trend}
-- Bollinger Upper: ${bb_upper:.2f}
-- Bollinger Lower: ${bb_lower:.2f}
-- ATR: ${atr:.2f}
-- Overall Trend: {trend}
-"""
+        price_step = self._decimal_step(price * PRICE_STEP_FRACTION)
+        macd_step = self._decimal_step(price * MACD_STEP_FRACTION)
+        quantize = self._quantize
+        to_float = self._safe_float
+        indicators = INDICATOR_DEFAULTS | technical_indicators
+        volume = to_float(market_data.get('volume', 0))
         
         if current_position:
-            entry_price = self._safe_float(current_position.get('entry_price', 0))
-            size = self._safe_float(current_position.get('size', 0))
-            leverage = self._safe_float(current_position.get('leverage', 1))
-            pnl_pct = self._safe_float(self._calculate_pnl(current_position, price))
-
-            prompt += f"""
-## Current Position
-- Side: {'LONG' if current_position.get('is_long') else 'SHORT'}
-- Size: {size:.4f}
-- Entry Price: ${entry_price:.2f}
-- Leverage: {leverage:.2f}x
-- Unrealized PnL: {pnl_pct:.2f}%
-"""
+            position_section = POSITION_SECTION_TEMPLATE.format_map({
+                'side': 'LONG' if current_position.get('is_long') else 'SHORT',
+                'size': self._safe_float(current_position.get('size', 0)),
+                'entry_price': self._safe_float(current_position.get('entry_price', 0)),
+                'leverage': self._safe_float(current_position.get('leverage', 1)),
+                'pnl_pct': self._safe_float(self._calculate_pnl(current_position, price)),
+            })
         else:
-            prompt += "\n## Current Position\n- No open position\n"
+            position_section = NO_POSITION_SECTION
         
-        prompt += """
-Based on this data, should I BUY, SELL, or HOLD? Provide your recommendation in the specified JSON format with detailed reasoning."""
+        values = {
+            name: quantize(to_float(indicators[name]), price_step)
+            for name in PRICE_LEVEL_INDICATORS
+        }
+        values.update(
+            coin=coin,
+            price=quantize(price, price_step),
+            volume=quantize(volume, self._decimal_step(volume * VOLUME_STEP_FRACTION)),
+            rsi=quantize(to_float(indicators['rsi']), RSI_STEP),
+            rsi_signal=indicators['rsi_signal'],
+            macd=quantize(to_float(indicators['macd']), macd_step),
+            macd_signal=quantize(to_float(indicators['macd_signal']), macd_step),
+            # The indicator summary stores the MACD direction under macd_signal
+            macd_trend=technical_indicators.get('macd_signal', 'neutral'),
+            trend=indicators['trend'],
+            position_section=position_section,
+        )
         
-        return prompt
+        # Fill the template in one pass; the static skeleton is built once at import
+        return ANALYSIS_PROMPT_TEMPLATE.format_map(values)
 
     def _log_dialog(self, coin: str, prompt: str, response_text: str) -> None:
         """Persist Deepseek prompt/response to the shared log file."""
@@ -212,10 +674,24 @@ Based on this data, should I BUY, SELL, or HOLD? Provide your recommendation in
         }
         try:
             with open(self.dialog_log_path, "a", encoding="utf-8") as log_file:
-                log_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                log_file.write(json_utils.dumps(entry) + "\n")
         except Exception as exc:
             self.logger.error(f"Failed to persist AI dialog: {exc}")
 
+    @staticmethod
+    def _decimal_step(size: float) -> float:
+        """Largest power of ten not above size (0 for non-positive sizes)"""
+        if size <= 0:
+            return 0.0
+        return 10.0 ** math.floor(math.log10(size))
+    
+    @staticmethod
+    def _quantize(value: float, step: float) -> float:
+        """Snap value to the nearest multiple of step (unchanged when step is 0)"""
+        if step <= 0:
+            return value
+        return round(value / step) * step
+    
     @staticmethod
     def _safe_float(value: Any, default: float = 0.0) -> float:
         """Best-effort conversion to float."""
@@ -226,56 +702,47 @@ Based on this data, should I BUY, SELL, or HOLD? Provide your recommendation in
         except (TypeError, ValueError):
             return float(default)
     
+    @classmethod
+    def _finite_float(cls, value: Any, default: float = 0.0) -> float:
+        """Like _safe_float, but "nan"/"inf" also fall back to the default."""
+        result = cls._safe_float(value, default)
+        return result if math.isfinite(result) else float(default)
+    
     def _calculate_pnl(self, position: Dict[str, Any], current_price: float) -> float:
         """Calculate PnL percentage"""
         entry_price = position.get('entry_price', 0)
-        is_long = position.get('is_long', True)
-        
-        if entry_price == 0:
+        if not entry_price:
             return 0
         
-        if is_long:
-            pnl_pct = ((current_price - entry_price) / entry_price) * 100
-        else:
-            pnl_pct = ((entry_price - current_price) / entry_price) * 100
-        
-        return pnl_pct
+        # A short gains what a long loses: one expression with a direction sign
+        sign = 1.0 if position.get('is_long', True) else -1.0
+        return sign * (current_price - entry_price) / entry_price * 100
     
     def _parse_decision(self, decision_text: str) -> Dict[str, Any]:
         """Parse AI decision from text response"""
         try:
-            # Try to extract JSON from the response
-            # Look for JSON block
-            start_idx = decision_text.find('{')
-            end_idx = decision_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = decision_text[start_idx:end_idx]
-                decision = json.loads(json_str)
-                
-                # Validate and normalize
-                decision['action'] = decision.get('action', 'hold').lower()
-                decision['confidence'] = float(decision.get('confidence', 0.5))
-                decision['leverage'] = int(decision.get('leverage', 3))
-                
-                # Ensure confidence is in valid range
-                decision['confidence'] = max(0.0, min(1.0, decision['confidence']))
-                
-                return decision
-            else:
-                # Fallback: parse from text
-                return self._parse_text_decision(decision_text)
-                
-        except json.JSONDecodeError as e:
-            self.logger.warning(f"Failed to parse JSON decision: {e}")
+            decision = json_utils.parse_json_object(decision_text)
+        except ValueError as e:
+            # No usable JSON object: fall back to reading the text
+            self.text_fallbacks += 1
+            self.logger.warning(
+                f"Failed to parse JSON decision ({self.text_fallbacks} text fallbacks so far): {e}"
+            )
             return self._parse_text_decision(decision_text)
-        except Exception as e:
-            self.logger.error(f"Error parsing decision: {e}")
-            return {
-                'action': 'hold',
-                'confidence': 0,
-                'reasoning': 'Failed to parse decision'
-            }
+        return self._normalize_decision(decision)
+    
+    def _normalize_decision(self, decision: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and normalize a decision against the schema in the system prompt"""
+        # Numbers may arrive as strings
+        action = str(decision.get('action') or 'hold').lower()
+        decision['action'] = action if action in DECISION_ACTIONS else 'hold'
+        decision['confidence'] = max(0.0, min(1.0, self._finite_float(decision.get('confidence'), 0.5)))
+        decision['leverage'] = max(1, min(5, int(self._finite_float(decision.get('leverage'), 3))))
+        for field in ('entry_price', 'stop_loss', 'take_profit'):
+            if field in decision:
+                decision[field] = self._finite_float(decision[field])
+        
+        return decision
     
     def _parse_text_decision(self, text: str) -> Dict[str, Any]:
         """Parse decision from plain text response"""
@@ -319,15 +786,16 @@ Based on this data, should I BUY, SELL, or HOLD? Provide your recommendation in
             Optimized parameters
         """
         try:
+            win_rate, avg_profit, max_drawdown = self._performance_stats(historical_performance)
             prompt = f"""Analyze the following trading performance and suggest optimized parameters:
 
 ## Current Parameters
-{json.dumps(current_parameters, indent=2)}
+{json_utils.dumps(current_parameters)}
 
 ## Recent Performance (last {len(historical_performance)} trades)
-Win Rate: {self._calculate_win_rate(historical_performance):.2%}
-Average Profit: {self._calculate_avg_profit(historical_performance):.2f}%
-Max Drawdown: {self._calculate_max_drawdown(historical_performance):.2f}%
+Win Rate: {win_rate:.2%}
+Average Profit: {avg_profit:.2f}%
+Max Drawdown: {max_drawdown:.2f}%
 
 Based on this performance, suggest optimized parameters to improve results while managing risk.
 Provide your response in JSON format with the same parameter structure."""
@@ -335,10 +803,7 @@ Provide your response in JSON format with the same parameter structure."""
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in quantitative trading strategy optimization."
-                    },
+                    self._optimizer_system_message,
                     {
                         "role": "user",
                         "content": prompt
@@ -351,51 +816,61 @@ Provide your response in JSON format with the same parameter structure."""
             optimized_text = response.choices[0].message.content
             
             # Parse optimized parameters
-            start_idx = optimized_text.find('{')
-            end_idx = optimized_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = optimized_text[start_idx:end_idx]
-                optimized_params = json.loads(json_str)
-                
-                self.logger.info("Strategy parameters optimized by AI")
-                return optimized_params
-            else:
+            try:
+                optimized_params = json_utils.parse_json_object(optimized_text)
+            except ValueError as e:
+                self.logger.warning(f"Could not parse optimized parameters: {e}")
                 return current_parameters
+            
+            self.logger.info("Strategy parameters optimized by AI")
+            return optimized_params
                 
         except Exception as e:
             self.logger.error(f"Error optimizing parameters: {e}")
             return current_parameters
     
+    @staticmethod
+    def _pnl_array(trades: List[Dict[str, Any]]) -> np.ndarray:
+        """Trade PnLs as a float array, read in one pass"""
+        return np.fromiter(
+            (t.get('pnl', 0) for t in trades), dtype=np.float64, count=len(trades)
+        )
+    
+    @staticmethod
+    def _max_drawdown_pct(pnl: np.ndarray) -> float:
+        """Largest fall from a positive cumulative-PnL peak, in percent"""
+        cumulative = np.cumsum(pnl)
+        peak = np.maximum.accumulate(cumulative)
+        drawdown = np.divide(
+            peak - cumulative, peak, out=np.zeros_like(cumulative), where=peak > 0
+        )
+        return float(drawdown.max()) * 100
+    
+    def _performance_stats(self, trades: List[Dict[str, Any]]) -> Tuple[float, float, float]:
+        """Win rate, average profit and max drawdown (%) from a single PnL array"""
+        if not trades:
+            return 0.0, 0.0, 0.0
+        pnl = self._pnl_array(trades)
+        return float((pnl > 0).mean()), float(pnl.mean()), self._max_drawdown_pct(pnl)
+    
     def _calculate_win_rate(self, trades: List[Dict[str, Any]]) -> float:
         """Calculate win rate from trades"""
         if not trades:
             return 0
-        wins = sum(1 for t in trades if t.get('pnl', 0) > 0)
-        return wins / len(trades)
+        return float((self._pnl_array(trades) > 0).mean())
     
     def _calculate_avg_profit(self, trades: List[Dict[str, Any]]) -> float:
         """Calculate average profit from trades"""
         if not trades:
             return 0
-        total_pnl = sum(t.get('pnl', 0) for t in trades)
-        return total_pnl / len(trades)
+        return float(self._pnl_array(trades).mean())
     
     def _calculate_max_drawdown(self, trades: List[Dict[str, Any]]) -> float:
         """Calculate maximum drawdown from trades"""
         if not trades:
             return 0
-        
-        cumulative = 0
-        peak = 0
-        max_dd = 0
-        
-        for trade in trades:
-            cumulative += trade.get('pnl', 0)
-            if cumulative > peak:
-                peak = cumulative
-            dd = (peak - cumulative) / peak if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
-        
-        return max_dd * 100
+        return self._max_drawdown_pct(self._pnl_array(trades))
+    
+    def close(self) -> None:
+        """Close the pooled API connection"""
+        self.client.close()
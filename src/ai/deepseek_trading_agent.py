@@ -2,19 +2,115 @@
 DeepSeek Trading Agent with nof1.ai-style prompts
 Supports structured JSON output for executable trading decisions
 """
-import json
+import asyncio
+import copy
 import os
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from ..utils.logger import get_logger
+from ..utils import json_utils
+from ..utils.cache import TTLCache, prompt_key
+from ..utils.http_client import create_async_http_client, create_http_client
 from ..utils.config_loader import get_config
-from ..utils.constants import ALLOWED_SYMBOLS, DIRECTION_LONG, DIRECTION_SHORT
+from ..utils.constants import ALLOWED_SYMBOLS, ALLOWED_SYMBOLS_SET, DIRECTION_LONG, DIRECTION_SHORT
 from ..news.news_analyzer import NewsAnalyzer
 
 
+# Per-cycle (volatile) context prompt in nof1.ai style with news integration
+CONTEXT_PROMPT_TEMPLATE = """**CONTEXT UPDATE**:
+
+**Current Time**: {current_time}
+
+═══════════════════════════════════════════════════════════════
+SECTION 1: NEWS CONTEXT
+═══════════════════════════════════════════════════════════════
+
+Before analyzing technical data, review the latest news developments that may be driving market movements.
+
+───────────────────────────────────────────────────────────────
+1A. TODAY'S HOURLY NEWS UPDATES
+───────────────────────────────────────────────────────────────
+
+{today_hourly_news}
+
+───────────────────────────────────────────────────────────────
+1B. PAST 7 DAYS DAILY NEWS SUMMARIES
+───────────────────────────────────────────────────────────────
+
+{past_7_days_summaries}
+
+═══════════════════════════════════════════════════════════════
+SECTION 2: MARKET DATA
+═══════════════════════════════════════════════════════════════
+
+CURRENT MARKET STATE FOR ALL COINS
+
+{market_data_text}
+
+**Unavailable Symbols** (skip these): {unavailable_str}
+
+═══════════════════════════════════════════════════════════════
+SECTION 3: ACCOUNT INFORMATION
+═══════════════════════════════════════════════════════════════
+
+HERE IS YOUR ACCOUNT INFORMATION & PERFORMANCE
+
+{positions_text}
+
+{orders_text}
+
+**Reminder**: Follow the SECTION 4 decision steps from your instructions. Skip unavailable symbols: {unavailable_str}
+"""
+
+
+# Static decision instructions, sent once in the system message so they form
+# part of the cacheable prompt prefix instead of the per-cycle context
+DECISION_INSTRUCTIONS = """═══════════════════════════════════════════════════════════════
+SECTION 4: YOUR TRADING DECISION
+═══════════════════════════════════════════════════════════════
+
+Each context update that follows gives you NEWS + MARKET DATA + POSITIONS. Based on that information:
+
+STEP 1: NEWS UPDATE CHECK
+1. Has any new news emerged since your last decision?
+2. Does any new news contradict your current positions?
+3. Are there new catalysts that create opportunities?
+
+STEP 2: POSITION REVIEW
+4. How are your current positions performing relative to your thesis?
+5. Is the market reacting to news as expected?
+6. Should you hold, adjust stop-loss/take-profit, or close positions?
+
+STEP 3: NEW OPPORTUNITIES
+7. Are there new opportunities based on updated news or technicals?
+8. Which coins have the clearest setup now?
+
+STEP 4: RISK MANAGEMENT
+9. What are the key risks (technical and news-based) to monitor?
+10. Should position sizes be adjusted based on new information?
+
+STEP 5: OUTPUT
+Please provide your trading decisions in the required JSON format, ensuring:
+- "market_view" section highlights any new developments from news
+- "candidates" array includes actions for both existing and new positions
+- "rationale" explains how news + market data support each decision
+
+CRITICAL: Always check for news updates first, then analyze how the market is reacting.
+
+**CONSTRAINTS**:
+- Only trade: XRP, DOGE, BTC, ETH, SOL, BNB
+- Both LONG and SHORT allowed
+- Skip the unavailable symbols listed in the context update
+
+**OUTPUT**: Valid JSON only, no additional text.
+"""
+
+
 class DeepseekTradingAgent:
     """
     AI trading agent powered by Deepseek with structured prompt system
@@ -41,17 +137,59 @@ class DeepseekTradingAgent:
         self.max_tokens = config.get('max_tokens', 2000)
         self.temperature = config.get('temperature', 1.0)  # 1.0 for data analysis
         
+        # Optional per-symbol mode: one concurrent request per symbol instead of
+        # a single prompt covering all of them
+        self.split_by_symbol = config.get('split_by_symbol', False)
+        self.max_concurrent_requests = config.get('max_concurrent_requests', 8)
+        # Stream replies so candidates can be acted on before generation ends
+        self.stream = config.get('stream', True)
+        # Ask for a bare JSON object (response_format json_object) so replies
+        # parse directly instead of being extracted from prose or fences
+        self.json_mode = config.get('json_mode', True)
+        # Per-request timeout and SDK retry budget (exponential backoff on
+        # timeouts, 429s and 5xx) so one stuck call cannot stall a cycle
+        self.request_timeout = config.get('request_timeout', 30.0)
+        self.max_retries = config.get('max_retries', 2)
+        # Reuse the previous plan when a cycle's context is unchanged; a TTL
+        # still forces a fresh decision periodically (0 disables the cache)
+        decision_cache_ttl = config.get('decision_cache_ttl', 600)
+        self.decision_cache = (
+            TTLCache(maxsize=config.get('decision_cache_size', 32), ttl=decision_cache_ttl)
+            if decision_cache_ttl > 0 else None
+        )
+        
         # Initialize OpenAI client (Deepseek is OpenAI-compatible)
+        # over one pooled keep-alive (HTTP/2 when available) connection
+        self.http_client = create_http_client(timeout=self.request_timeout)
         self.client = OpenAI(
             api_key=self.api_key,
-            base_url=self.api_url
+            base_url=self.api_url,
+            http_client=self.http_client,
+            timeout=self.request_timeout,
+            max_retries=self.max_retries
         )
         
+        # Keyword arguments shared by every chat completion request
+        self._request_options: Dict[str, Any] = {
+            'model': self.model,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+        }
+        if self.json_mode:
+            self._request_options['response_format'] = {'type': 'json_object'}
+        
         # Load prompt templates
         self.orchestrator_prompt = self._load_orchestrator_prompt()
+        # Immutable system prefix (role, schema, decision steps) shared by every
+        # request, so Deepseek can serve it from its prompt prefix cache
+        self.system_prompt = f"{self.orchestrator_prompt}\n\n{DECISION_INSTRUCTIONS}"
         
         # Context cache for historical decisions
-        self.context_history = []
+        self.context_history: Deque[Dict[str, Any]] = deque(maxlen=5)
+        # Rendered history summary, reset whenever a decision is added
+        self._history_summary: Optional[str] = None
+        # Per-symbol market section formatter, created on first use
+        self._market_formatter = None
         
         # News analyzer for news integration
         self.news_analyzer = news_analyzer
@@ -63,6 +201,8 @@ class DeepseekTradingAgent:
         project_root = Path(__file__).parent.parent.parent
         self.dialog_log_path = project_root / "logs" / "ai_dialogs.log"
         self.dialog_log_path.parent.mkdir(parents=True, exist_ok=True)
+        # Buffered append handle, opened on first use and flushed once per cycle
+        self._dialog_fp = None
         
         self.logger.info(f"DeepseekTradingAgent initialized with model: {self.model}, temperature: {self.temperature}")
         self.logger.info(f"Allowed symbols: {ALLOWED_SYMBOLS}")
@@ -148,7 +288,8 @@ Before generating trading recommendations, you MUST:
         current_positions: Dict[str, Any],
         unavailable_symbols: List[str],
         news_summary: str = "",
-        orders: List[Dict[str, Any]] = None
+        orders: List[Dict[str, Any]] = None,
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Generate comprehensive trading plan using Deepseek AI
@@ -159,55 +300,68 @@ Before generating trading recommendations, you MUST:
             unavailable_symbols: List of symbols to skip
             news_summary: Recent news/events summary
             orders: Previous orders status
+            on_candidate: Called with each validated candidate as soon as it is
+                fully streamed, before the rest of the plan arrives
         
         Returns:
             Structured trading plan as dictionary
         """
         try:
+            # One timestamp for the prompt, dialog log and history entry
+            current_time = datetime.now().isoformat()
+            
+            if self.split_by_symbol and len(market_data) > 1:
+                return self._generate_split_trading_plan(
+                    market_data,
+                    current_positions,
+                    unavailable_symbols,
+                    news_summary,
+                    orders,
+                    current_time
+                )
+            
             # Build context prompt
             context_prompt = self._build_context_prompt(
                 market_data,
                 current_positions,
                 unavailable_symbols,
                 news_summary,
-                orders
+                orders,
+                current_time
             )
             
-            # Prepare messages with context caching
-            messages = [
-                {
-                    "role": "system",
-                    "content": self.orchestrator_prompt
-                },
-                {
-                    "role": "user",
-                    "content": context_prompt
-                }
-            ]
-            
-            # Add historical context (last 3 decisions)
-            if self.context_history:
-                history_summary = self._summarize_context_history()
-                messages.insert(1, {
-                    "role": "assistant",
-                    "content": f"Previous decisions context:\n{history_summary}"
-                })
+            # Identical market/position context (ignoring the clock) -> same plan
+            cache_key = prompt_key(context_prompt.replace(current_time, "", 1))
+            cached_plan = self.decision_cache.get(cache_key) if self.decision_cache else None
+            if cached_plan is not None:
+                self.logger.info(
+                    "Context unchanged, reusing cached trading plan (cache hit rate %.0f%%)",
+                    self.decision_cache.hit_rate * 100
+                )
+                trading_plan = copy.deepcopy(cached_plan)
+                self._add_to_context_history(trading_plan, current_time)
+                return trading_plan
             
             # Call Deepseek API
             self.logger.info("Calling Deepseek API for trading plan...")
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens
-            )
+            messages = self._build_messages(context_prompt)
+            if self.stream:
+                decision_text, reasoning = self._stream_completion(messages, unavailable_symbols, on_candidate)
+            else:
+                response = self.client.chat.completions.create(
+                    messages=messages,
+                    **self._request_options
+                )
+                message = response.choices[0].message
+                decision_text = message.content
+                reasoning = self._reasoning_of(message)
+                self._log_cache_usage(response.usage)
             
             # Parse response
-            decision_text = response.choices[0].message.content
-            self.logger.debug(f"Raw AI response: {decision_text[:500]}...")
+            self.logger.debug("Raw AI response: %.500s...", decision_text)
             
-            # Log dialog for debugging
-            self._log_dialog(context_prompt, decision_text)
+            # Log dialog (with the model's reasoning, if any) for debugging
+            self._log_dialog(context_prompt, decision_text, current_time, reasoning)
             
             # Parse JSON
             trading_plan = self._parse_json_response(decision_text)
@@ -215,18 +369,213 @@ Before generating trading recommendations, you MUST:
             # Validate trading plan
             trading_plan = self._validate_trading_plan(trading_plan, unavailable_symbols)
             
+            # Cache real decisions only, never the parse-failure fallback
+            if self.decision_cache is not None and "retry_ai_analysis" not in trading_plan.get("next_actions", []):
+                self.decision_cache.set(cache_key, copy.deepcopy(trading_plan))
+            
             # Add to context history
-            self._add_to_context_history(trading_plan)
+            self._add_to_context_history(trading_plan, current_time)
             
             self.logger.info(
-                f"Generated trading plan with {len(trading_plan.get('candidates', []))} candidates"
+                "Generated trading plan with %d candidates", len(trading_plan.get('candidates', []))
             )
             
             return trading_plan
             
         except Exception as e:
-            self.logger.error(f"Error generating trading plan: {e}", exc_info=True)
+            self.logger.error("Error generating trading plan: %r", e)
+            return self._get_fallback_plan()
+    
+    def _build_messages(self, context_prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages for one trading-plan request"""
+        # Prepare messages with context caching
+        messages = [
+            {
+                "role": "system",
+                "content": self.system_prompt
+            },
+            {
+                "role": "user",
+                "content": context_prompt
+            }
+        ]
+        
+        # Add historical context (last 3 decisions)
+        if self.context_history:
+            history_summary = self._summarize_context_history()
+            messages.insert(1, {
+                "role": "assistant",
+                "content": f"Previous decisions context:\n{history_summary}"
+            })
+        
+        return messages
+    
+    def _stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        unavailable_symbols: List[str],
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Stream a completion, handing each candidate to on_candidate once complete
+        
+        Args:
+            messages: Chat messages to send
+            unavailable_symbols: List of symbols to skip
+            on_candidate: Callback for each validated candidate
+        
+        Returns:
+            Full reply text and the streamed reasoning text (None if the
+            model sent none)
+        """
+        stream = self.client.chat.completions.create(
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._request_options
+        )
+        
+        scanner = json_utils.StreamingObjectScanner()
+        reasoning_parts: List[str] = []
+        for chunk in stream:
+            if not chunk.choices:
+                # The final chunk carries only token usage
+                self._log_cache_usage(getattr(chunk, 'usage', None))
+                continue
+            delta = chunk.choices[0].delta
+            reasoning = self._reasoning_of(delta)
+            if reasoning:
+                reasoning_parts.append(reasoning)
+            content = delta.content
+            if not content:
+                continue
+            for candidate in scanner.feed(content):
+                if on_candidate and self._validate_candidate(candidate, unavailable_symbols):
+                    on_candidate(candidate)
+        
+        return scanner.text, "".join(reasoning_parts) or None
+    
+    @staticmethod
+    def _reasoning_of(message: Any) -> Optional[str]:
+        """Return the reasoning text deepseek-reasoner attaches to a message or delta"""
+        reasoning = getattr(message, 'reasoning_content', None)
+        return reasoning if isinstance(reasoning, str) else None
+    
+    def _log_cache_usage(self, usage: Any) -> None:
+        """Log how much of the prompt was served from Deepseek's prefix cache"""
+        hit_tokens = getattr(usage, 'prompt_cache_hit_tokens', None)
+        if hit_tokens is None:
+            return
+        miss_tokens = getattr(usage, 'prompt_cache_miss_tokens', 0)
+        self.logger.info("Prompt cache: %s hit / %s miss tokens", hit_tokens, miss_tokens)
+    
+    def _generate_split_trading_plan(
+        self,
+        market_data: Dict[str, Dict[str, Any]],
+        current_positions: Dict[str, Any],
+        unavailable_symbols: List[str],
+        news_summary: str,
+        orders: List[Dict[str, Any]],
+        current_time: str
+    ) -> Dict[str, Any]:
+        """
+        Generate a trading plan with one concurrent Deepseek request per symbol
+        
+        The per-symbol prompts share the system prompt and go out together, so
+        the cycle waits roughly one round trip instead of one giant generation.
+        
+        Args:
+            market_data: Dictionary of symbol -> market data
+            current_positions: Current portfolio positions
+            unavailable_symbols: List of symbols to skip
+            news_summary: Recent news/events summary
+            orders: Previous orders status
+            current_time: ISO timestamp shared by every request in this cycle
+        
+        Returns:
+            Merged trading plan as dictionary
+        """
+        symbols = [symbol for symbol in self.allowed_symbols if symbol in market_data]
+        # News is the same for every symbol: read and format it once
+        news_sections = self._format_news_sections()
+        prompts = [
+            self._build_context_prompt(
+                {symbol: market_data[symbol]},
+                current_positions,
+                unavailable_symbols,
+                news_summary,
+                orders,
+                current_time,
+                news_sections
+            )
+            for symbol in symbols
+        ]
+        
+        self.logger.info("Calling Deepseek API for %d symbols concurrently...", len(symbols))
+        replies = asyncio.run(self._request_completions(prompts))
+        
+        merged_plan = None
+        candidates = []
+        for symbol, prompt, reply in zip(symbols, prompts, replies):
+            if isinstance(reply, Exception):
+                self.logger.error(f"{symbol}: Deepseek request failed: {reply}")
+                continue
+            
+            self._log_dialog(prompt, reply.content, current_time, self._reasoning_of(reply))
+            plan = self._parse_json_response(reply.content)
+            # Each reply may only speak for its own symbol
+            candidates.extend(
+                c for c in plan.get('candidates', []) if c.get('symbol') == symbol
+            )
+            if merged_plan is None:
+                merged_plan = plan
+        
+        if merged_plan is None:
             return self._get_fallback_plan()
+        
+        merged_plan['candidates'] = candidates
+        trading_plan = self._validate_trading_plan(merged_plan, unavailable_symbols)
+        self._add_to_context_history(trading_plan, current_time)
+        
+        self.logger.info(
+            "Generated trading plan with %d candidates", len(trading_plan.get('candidates', []))
+        )
+        
+        return trading_plan
+    
+    async def _request_completions(self, prompts: List[str]) -> List[Any]:
+        """
+        Send several context prompts concurrently over one async client
+        
+        Args:
+            prompts: Context prompts to send
+        
+        Returns:
+            Reply messages (or exceptions) in prompt order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        # The client is scoped to this event loop; its pool is shared by the batch
+        async with AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url,
+            http_client=create_async_http_client(timeout=self.request_timeout),
+            timeout=self.request_timeout,
+            max_retries=self.max_retries
+        ) as client:
+            async def request(prompt: str) -> Any:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        messages=self._build_messages(prompt),
+                        **self._request_options
+                    )
+                    self._log_cache_usage(response.usage)
+                    return response.choices[0].message
+            
+            return await asyncio.gather(
+                *(request(prompt) for prompt in prompts),
+                return_exceptions=True
+            )
     
     def _build_context_prompt(
         self,
@@ -234,14 +583,50 @@ Before generating trading recommendations, you MUST:
         current_positions: Dict[str, Any],
         unavailable_symbols: List[str],
         news_summary: str,
-        orders: List[Dict[str, Any]]
+        orders: List[Dict[str, Any]],
+        current_time: Optional[str] = None,
+        news_sections: Optional[Tuple[str, str]] = None
     ) -> str:
         """Build context prompt for trading decision with news integration"""
         
         # Format current time
-        current_time = datetime.now().isoformat()
+        if current_time is None:
+            current_time = datetime.now().isoformat()
         
-        # Get formatted news if news_analyzer is available
+        # Get formatted news unless the caller already has it
+        if news_sections is None:
+            news_sections = self._format_news_sections()
+        today_hourly_news, past_7_days_summaries = news_sections
+        
+        # Format market data with detailed technical indicators
+        formatter = self._get_market_formatter()
+        market_data_text = "\n".join(
+            formatter.format_market_data_for_prompt(market_data[symbol])
+            for symbol in self.allowed_symbols
+            if symbol in market_data
+        )
+        
+        # Format unavailable symbols
+        unavailable_str = ", ".join(unavailable_symbols) if unavailable_symbols else "None"
+        
+        # Format positions and orders as compact JSON (fewer input tokens than
+        # Python reprs, and datetimes render as short ISO strings)
+        positions_text = json_utils.dumps(current_positions) if current_positions else "No current positions"
+        orders_text = json_utils.dumps(orders) if orders else "No previous orders"
+        
+        # Fill the nof1.ai-style template; the static skeleton is built once at import
+        return CONTEXT_PROMPT_TEMPLATE.format_map({
+            'current_time': current_time,
+            'today_hourly_news': today_hourly_news,
+            'past_7_days_summaries': past_7_days_summaries,
+            'market_data_text': market_data_text,
+            'unavailable_str': unavailable_str,
+            'positions_text': positions_text,
+            'orders_text': orders_text,
+        })
+    
+    def _format_news_sections(self) -> Tuple[str, str]:
+        """Return (today's hourly news, past 7 days summaries) formatted for the prompt"""
         today_hourly_news = "No hourly news available for today."
         past_7_days_summaries = "No daily summaries available for past 7 days."
         
@@ -253,147 +638,29 @@ Before generating trading recommendations, you MUST:
             except Exception as e:
                 self.logger.warning(f"Failed to retrieve news data: {e}")
         
-        # Import EnhancedMarketDataCollector for formatting
-        from ..data.enhanced_market_data import EnhancedMarketDataCollector
-        
-        # Format market data with detailed technical indicators
-        market_data_sections = []
-        for symbol in self.allowed_symbols:
-            if symbol in market_data:
-                formatted = EnhancedMarketDataCollector(None).format_market_data_for_prompt(market_data[symbol])
-                market_data_sections.append(formatted)
-        
-        market_data_text = "\n".join(market_data_sections)
-        
-        # Format unavailable symbols
-        unavailable_str = ", ".join(unavailable_symbols) if unavailable_symbols else "None"
-        
-        # Format positions and orders
-        positions_text = str(current_positions) if current_positions else "No current positions"
-        orders_text = str(orders) if orders else "No previous orders"
-        
-        # Build prompt in nof1.ai style with news integration
-        prompt = f"""**CONTEXT UPDATE**:
-
-**Current Time**: {current_time}
-
-═══════════════════════════════════════════════════════════════
-SECTION 1: NEWS CONTEXT
-═══════════════════════════════════════════════════════════════
-
-Before analyzing technical data, review the latest news developments that may be driving market movements.
-
-───────────────────────────────────────────────────────────────
-1A. TODAY'S HOURLY NEWS UPDATES
-───────────────────────────────────────────────────────────────
-
-{today_hourly_news}
-
-───────────────────────────────────────────────────────────────
-1B. PAST 7 DAYS DAILY NEWS SUMMARIES
-───────────────────────────────────────────────────────────────
-
-{past_7_days_summaries}
-
-═══════════════════════════════════════════════════════════════
-SECTION 2: MARKET DATA
-═══════════════════════════════════════════════════════════════
-
-CURRENT MARKET STATE FOR ALL COINS
-
-{market_data_text}
-
-**Unavailable Symbols** (skip these): {unavailable_str}
-
-═══════════════════════════════════════════════════════════════
-SECTION 3: ACCOUNT INFORMATION
-═══════════════════════════════════════════════════════════════
-
-HERE IS YOUR ACCOUNT INFORMATION & PERFORMANCE
-
-{positions_text}
-
-{orders_text}
-
-═══════════════════════════════════════════════════════════════
-SECTION 4: YOUR TRADING DECISION
-═══════════════════════════════════════════════════════════════
-
-Based on the comprehensive information above (NEWS + MARKET DATA + POSITIONS):
-
-STEP 1: NEWS UPDATE CHECK
-1. Has any new news emerged since your last decision?
-2. Does any new news contradict your current positions?
-3. Are there new catalysts that create opportunities?
-
-STEP 2: POSITION REVIEW
-4. How are your current positions performing relative to your thesis?
-5. Is the market reacting to news as expected?
-6. Should you hold, adjust stop-loss/take-profit, or close positions?
-
-STEP 3: NEW OPPORTUNITIES
-7. Are there new opportunities based on updated news or technicals?
-8. Which coins have the clearest setup now?
-
-STEP 4: RISK MANAGEMENT
-9. What are the key risks (technical and news-based) to monitor?
-10. Should position sizes be adjusted based on new information?
-
-STEP 5: OUTPUT
-Please provide your trading decisions in the required JSON format, ensuring:
-- "market_view" section highlights any new developments from news
-- "candidates" array includes actions for both existing and new positions
-- "rationale" explains how news + market data support each decision
-
-CRITICAL: Always check for news updates first, then analyze how the market is reacting.
-
-**CONSTRAINTS**:
-- Only trade: XRP, DOGE, BTC, ETH, SOL, BNB
-- Both LONG and SHORT allowed
-- Skip unavailable symbols: {unavailable_str}
-
-**OUTPUT**: Valid JSON only, no additional text.
-"""
-        
-        return prompt
+        return today_hourly_news, past_7_days_summaries
+    
+    def _get_market_formatter(self):
+        """Return the shared per-symbol market section formatter"""
+        if self._market_formatter is None:
+            # Imported here so the agent module does not pull in pandas
+            from ..data.enhanced_market_data import EnhancedMarketDataCollector
+            self._market_formatter = EnhancedMarketDataCollector(None)
+        return self._market_formatter
     
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """
         Parse JSON from AI response, handling markdown code blocks
+        
+        A single precompiled regex grabs the outermost object, so fenced,
+        bare and prose-embedded replies all take the same path.
         """
         try:
-            # Remove markdown code blocks if present
-            text = response_text.strip()
-            if text.startswith('```'):
-                # Remove opening ```json or ```
-                text = text.split('\n', 1)[1] if '\n' in text else text[3:]
-                # Remove closing ```
-                if text.endswith('```'):
-                    text = text[:-3]
-            
-            text = text.strip()
-            
-            # Parse JSON
-            parsed = json.loads(text)
-            return parsed
-            
-        except json.JSONDecodeError as e:
+            return json_utils.parse_json_object(response_text)
+        except ValueError as e:
             self.logger.error(f"JSON parse error: {e}")
             self.logger.error(f"Response text: {response_text[:1000]}")
             
-            # Try to extract JSON from text
-            try:
-                # Find first { and last }
-                start = response_text.find('{')
-                end = response_text.rfind('}')
-                if start != -1 and end != -1:
-                    json_str = response_text[start:end+1]
-                    parsed = json.loads(json_str)
-                    self.logger.info("Successfully extracted JSON from response")
-                    return parsed
-            except:
-                pass
-            
             # Return fallback
             return self._get_fallback_plan()
     
@@ -413,63 +680,75 @@ CRITICAL: Always check for news updates first, then analyze how the market is re
         original_count = len(plan.get('candidates', []))
         
         for candidate in plan.get('candidates', []):
-            symbol = candidate.get('symbol')
-            direction = candidate.get('direction')
-            direction_upper = str(direction).upper()
-
-            # Check symbol is allowed
-            if symbol not in ALLOWED_SYMBOLS:
-                self.logger.warning(f"Filtered out non-allowed symbol: {symbol}")
-                continue
-            
-            # Check symbol is available
-            if symbol in unavailable_symbols:
-                self.logger.warning(f"Filtered out unavailable symbol: {symbol}")
-                continue
-            
-            # Check direction is valid
-            if direction_upper in [DIRECTION_LONG, DIRECTION_SHORT]:
-                candidate['direction'] = direction_upper
-            elif direction_upper.startswith('HOLD'):
-                candidate['direction'] = direction_upper
-                self.logger.info(f"{symbol}: HOLD signal received ({direction_upper})")
-            else:
-                self.logger.warning(f"Invalid direction {direction} for {symbol}, skipping")
-                continue
-
-            validated_candidates.append(candidate)
+            if self._validate_candidate(candidate, unavailable_symbols):
+                validated_candidates.append(candidate)
         
         plan['candidates'] = validated_candidates
         
         self.logger.info(
-            f"Validated {len(validated_candidates)} candidates "
-            f"(filtered {original_count - len(validated_candidates)})"
+            "Validated %d candidates (filtered %d)",
+            len(validated_candidates), original_count - len(validated_candidates)
         )
         
         return plan
     
-    def _add_to_context_history(self, trading_plan: Dict[str, Any]):
+    def _validate_candidate(self, candidate: Dict[str, Any], unavailable_symbols: List[str]) -> bool:
+        """
+        Check a single candidate, normalizing its direction in place
+        
+        Returns:
+            True if the candidate may be executed
+        """
+        symbol = candidate.get('symbol')
+        direction = candidate.get('direction')
+        direction_upper = str(direction).upper()
+
+        # Check symbol is allowed
+        if symbol not in ALLOWED_SYMBOLS_SET:
+            self.logger.warning("Filtered out non-allowed symbol: %s", symbol)
+            return False
+        
+        # Check symbol is available
+        if symbol in unavailable_symbols:
+            self.logger.warning("Filtered out unavailable symbol: %s", symbol)
+            return False
+        
+        # Check direction is valid
+        if direction_upper in [DIRECTION_LONG, DIRECTION_SHORT]:
+            candidate['direction'] = direction_upper
+        elif direction_upper.startswith('HOLD'):
+            candidate['direction'] = direction_upper
+            self.logger.info("%s: HOLD signal received (%s)", symbol, direction_upper)
+        else:
+            self.logger.warning("Invalid direction %s for %s, skipping", direction, symbol)
+            return False
+        
+        return True
+    
+    def _add_to_context_history(self, trading_plan: Dict[str, Any], current_time: Optional[str] = None):
         """Add trading plan to context history for memory"""
+        self._history_summary = None
         self.context_history.append({
-            "timestamp": trading_plan.get("timestamp", datetime.now().isoformat()),
+            "timestamp": trading_plan.get("timestamp") or current_time or datetime.now().isoformat(),
             "candidates_count": len(trading_plan.get("candidates", [])),
             "symbols": [c.get("symbol") for c in trading_plan.get("candidates", [])]
         })
-        
-        # Keep only last 5 decisions
-        if len(self.context_history) > 5:
-            self.context_history = self.context_history[-5:]
     
     def _summarize_context_history(self) -> str:
-        """Summarize context history for prompt"""
+        """Summarize context history for prompt (rendered once per new decision)"""
         if not self.context_history:
             return "No previous decisions"
-        
-        summary = "Recent trading decisions:\n"
-        for i, ctx in enumerate(self.context_history[-3:], 1):
-            summary += f"{i}. {ctx['timestamp']}: {ctx['candidates_count']} candidates ({', '.join(ctx['symbols'])})\n"
-        
-        return summary
+        if self._history_summary is not None:
+            return self._history_summary
+        
+        recent = islice(self.context_history, max(0, len(self.context_history) - 3), None)
+        lines = ["Recent trading decisions:"]
+        lines.extend(
+            f"{i}. {ctx['timestamp']}: {ctx['candidates_count']} candidates ({', '.join(ctx['symbols'])})"
+            for i, ctx in enumerate(recent, 1)
+        )
+        self._history_summary = "\n".join(lines) + "\n"
+        return self._history_summary
     
     def _get_fallback_plan(self) -> Dict[str, Any]:
         """Return fallback plan when AI fails"""
@@ -574,7 +853,7 @@ CRITICAL: Always check for news updates first, then analyze how the market is re
                 }
                 
         except Exception as e:
-            self.logger.error(f"Error in analyze_market for {coin}: {e}", exc_info=True)
+            self.logger.error("Error in analyze_market for %s: %r", coin, e)
             return {
                 'action': 'hold',
                 'confidence': 0.0,
@@ -582,23 +861,48 @@ CRITICAL: Always check for news updates first, then analyze how the market is re
                 'risk_notes': []
             }
 
-    def _log_dialog(self, prompt: str, response_text: str) -> None:
+    def _log_dialog(
+        self,
+        prompt: str,
+        response_text: str,
+        timestamp: Optional[str] = None,
+        reasoning: Optional[str] = None
+    ) -> None:
         """
         Persist Deepseek prompt/response to the shared log file for debugging
         
         Args:
             prompt: The context prompt sent to AI
             response_text: The AI's response
+            timestamp: ISO time the request was built (defaults to now)
+            reasoning: The model's full reasoning text (deepseek-reasoner only)
         """
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "model": self.model,
             "prompt": prompt,
             "response": response_text,
         }
+        if reasoning:
+            entry["reasoning"] = reasoning
         try:
-            with open(self.dialog_log_path, "a", encoding="utf-8") as log_file:
-                log_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
-            self.logger.debug(f"Dialog logged to {self.dialog_log_path}")
+            if self._dialog_fp is None:
+                self._dialog_fp = open(
+                    self.dialog_log_path, "a", buffering=1 << 16, encoding="utf-8"
+                )
+            self._dialog_fp.write(json_utils.dumps(entry) + "\n")
+            self.logger.debug("Dialog logged to %s", self.dialog_log_path)
         except Exception as exc:
             self.logger.error(f"Failed to persist AI dialog: {exc}")
+    
+    def flush_logs(self) -> None:
+        """Flush buffered dialog log entries to disk"""
+        if self._dialog_fp is not None:
+            self._dialog_fp.flush()
+    
+    def close(self) -> None:
+        """Flush and close the dialog log and the pooled API connection"""
+        if self._dialog_fp is not None:
+            self._dialog_fp.close()
+            self._dialog_fp = None
+        self.client.close()
@@ -10,6 +10,55 @@ from datetime import datetime, timedelta
 from ..utils.logger import get_logger
 
 
+# Per-symbol prompt sections in the nof1.ai Alpha Arena layout, filled with
+# str.format_map so the static text is parsed once at import
+INTRADAY_PROMPT_TEMPLATE = """ALL {symbol} DATA
+current_price = {current_price:.6g}, current_ema20 = {current_ema20:.6g}, current_macd = {current_macd:.6g}, current_rsi (7 period) = {current_rsi7:.6g}
+
+In addition, here is the latest {symbol} open interest and funding rate for perps:
+
+Open Interest: Latest: {oi_latest:.2f} Average: {oi_average:.2f}
+
+Funding Rate: {funding_rate:.6g}
+
+Intraday series (3-minute intervals, oldest → latest):
+
+{symbol} mid prices: {mid_prices}
+
+EMA indicators (20-period): {ema_20}
+
+MACD indicators: {macd}
+
+RSI indicators (7-Period): {rsi_7}
+
+RSI indicators (14-Period): {rsi_14}
+"""
+
+LONGER_TERM_PROMPT_TEMPLATE = """
+Longer-term context (4-hour timeframe):
+
+20-Period EMA: {ema_20:.3f} vs. 50-Period EMA: {ema_50:.3f}
+
+3-Period ATR: {atr_3:.3f} vs. 14-Period ATR: {atr_14:.3f}
+
+Current Volume: {current_volume:.3f} vs. Average Volume: {avg_volume:.3f}
+
+MACD indicators: {macd_series}
+
+RSI indicators (14-Period): {rsi_14_series}
+"""
+
+
+def _finite_or_zero(value: Any) -> float:
+    """Return value as float, mapping NaN to 0"""
+    return 0 if np.isnan(value) else float(value)
+
+
+def _round_series(values: List[float]) -> List[float]:
+    """Round an indicator series to 3 decimals for display, mapping NaN to 0"""
+    return [round(x, 3) if not np.isnan(x) else 0 for x in values]
+
+
 class EnhancedMarketDataCollector:
     """
     Enhanced market data collector that provides detailed technical indicators
@@ -49,27 +98,21 @@ class EnhancedMarketDataCollector:
     
     def calculate_macd(self, prices: List[float], fast=12, slow=26, signal=9) -> List[float]:
         """Calculate MACD line (not including signal line)"""
-        ema_fast = self.calculate_ema(prices, fast)
-        ema_slow = self.calculate_ema(prices, slow)
-        
-        macd = []
-        for i in range(len(prices)):
-            if np.isnan(ema_fast[i]) or np.isnan(ema_slow[i]):
-                macd.append(np.nan)
-            else:
-                macd.append(ema_fast[i] - ema_slow[i])
+        ema_fast = np.asarray(self.calculate_ema(prices, fast), dtype=np.float64)
+        ema_slow = np.asarray(self.calculate_ema(prices, slow), dtype=np.float64)
         
-        return macd
+        # NaN propagates through the subtraction where either EMA is undefined
+        return (ema_fast - ema_slow).tolist()
     
     def calculate_rsi(self, prices: List[float], period: int) -> List[float]:
         """Calculate RSI"""
         if len(prices) < period + 1:
             return [np.nan] * len(prices)
         
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
+        deltas = np.diff(np.asarray(prices, dtype=np.float64))
         
-        gains = [d if d > 0 else 0 for d in deltas]
-        losses = [-d if d < 0 else 0 for d in deltas]
+        gains = np.clip(deltas, 0, None).tolist()
+        losses = np.clip(-deltas, 0, None).tolist()
         
         rsi = [np.nan]  # First value is NaN
         
@@ -101,22 +144,21 @@ class EnhancedMarketDataCollector:
         if len(df) < period:
             return [np.nan] * len(df)
         
-        high = df['high'].values
-        low = df['low'].values
-        close = df['close'].values
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
         
-        tr = []
-        for i in range(len(df)):
-            if i == 0:
-                tr.append(high[i] - low[i])
-            else:
-                hl = high[i] - low[i]
-                hc = abs(high[i] - close[i-1])
-                lc = abs(low[i] - close[i-1])
-                tr.append(max(hl, hc, lc))
+        # True range in one pass; the first bar has no previous close
+        tr = high - low
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([
+            tr[1:],
+            np.abs(high[1:] - prev_close),
+            np.abs(low[1:] - prev_close)
+        ])
         
         # Calculate ATR as EMA of TR
-        atr = self.calculate_ema(tr, period)
+        atr = self.calculate_ema(tr.tolist(), period)
         return atr
     
     def get_comprehensive_market_data(self, symbol: str) -> Dict[str, Any]:
@@ -129,115 +171,171 @@ class EnhancedMarketDataCollector:
         Returns:
             Dictionary with all market data and indicators
         """
+        return self.get_comprehensive_market_data_bulk([symbol])[symbol]
+    
+    def get_comprehensive_market_data_bulk(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get comprehensive market data for several symbols with batched requests
+        
+        Mid prices and exchange meta are fetched once for all symbols, and
+        every candle request (3m and 4h for each symbol) is issued in one
+        concurrent batch instead of serially per symbol.
+        
+        Args:
+            symbols: Trading symbols (e.g., ['BTC', 'ETH'])
+        
+        Returns:
+            Dictionary of symbol -> market data, in the order given
+        """
         try:
-            result = {
-                'symbol': symbol,
-                'available': True,
-                'error': None
-            }
-            
-            # Get current price
-            mids = self.market_data.get_all_mids()
-            if symbol not in mids:
-                result['available'] = False
-                result['error'] = 'Price not available'
-                return result
+            # Get current prices (snapshot shared across symbols in a cycle)
+            mids = self.market_data.get_all_mids_cached()
+            priced = [symbol for symbol in symbols if symbol in mids]
             
-            current_price = float(mids[symbol])
-            result['current_price'] = current_price
-            
-            # Get 3-minute candles for intraday analysis
+            # 3-minute candles for intraday analysis
             # Need at least 50 candles for proper indicator calculation (MACD needs 26+9=35)
             end_time = int(time.time() * 1000)
             start_time = end_time - (150 * 60 * 1000)  # 150 minutes = 50 candles
-            
-            df_3m = self.market_data.get_candles(symbol, '3m', start_time, end_time)
-            
-            if df_3m.empty:
-                result['available'] = False
-                result['error'] = 'Candle data not available'
-                return result
-            
-            # Use all available candles for calculation, but only show last 10 in output
-            prices_3m = df_3m['close'].tolist()
-            
-            # Calculate intraday indicators
-            ema_20_3m = self.calculate_ema(prices_3m, 20)
-            macd_3m = self.calculate_macd(prices_3m)
-            rsi_7_3m = self.calculate_rsi(prices_3m, 7)
-            rsi_14_3m = self.calculate_rsi(prices_3m, 14)
-            
-            result['intraday'] = {
-                'mid_prices': prices_3m[-10:],  # Only last 10 for display
-                'ema_20': ema_20_3m[-10:],
-                'macd': macd_3m[-10:],
-                'rsi_7': rsi_7_3m[-10:],
-                'rsi_14': rsi_14_3m[-10:],
-                'current_ema20': ema_20_3m[-1] if ema_20_3m else np.nan,
-                'current_macd': macd_3m[-1] if macd_3m else np.nan,
-                'current_rsi7': rsi_7_3m[-1] if rsi_7_3m else np.nan
-            }
-            
-            # Get 4-hour candles for longer-term context (last 40 candles = ~7 days)
+            # 4-hour candles for longer-term context (last 40 candles = ~7 days)
             start_time_4h = end_time - (40 * 4 * 60 * 60 * 1000)
-            df_4h = self.market_data.get_candles(symbol, '4h', start_time_4h, end_time)
             
-            if not df_4h.empty:
-                df_4h = df_4h.tail(40)
-                prices_4h = df_4h['close'].tolist()
-                
-                ema_20_4h = self.calculate_ema(prices_4h, 20)
-                ema_50_4h = self.calculate_ema(prices_4h, 50)
-                atr_3_4h = self.calculate_atr(df_4h, 3)
-                atr_14_4h = self.calculate_atr(df_4h, 14)
-                macd_4h = self.calculate_macd(prices_4h)
-                rsi_14_4h = self.calculate_rsi(prices_4h, 14)
-                
-                # Get last 10 values for arrays
-                result['longer_term'] = {
-                    'ema_20': ema_20_4h[-1] if len(ema_20_4h) > 0 else np.nan,
-                    'ema_50': ema_50_4h[-1] if len(ema_50_4h) > 0 else np.nan,
-                    'atr_3': atr_3_4h[-1] if len(atr_3_4h) > 0 else np.nan,
-                    'atr_14': atr_14_4h[-1] if len(atr_14_4h) > 0 else np.nan,
-                    'current_volume': df_4h['volume'].iloc[-1] if len(df_4h) > 0 else 0,
-                    'avg_volume': df_4h['volume'].mean() if len(df_4h) > 0 else 0,
-                    'macd_series': macd_4h[-10:] if len(macd_4h) >= 10 else macd_4h,
-                    'rsi_14_series': rsi_14_4h[-10:] if len(rsi_14_4h) >= 10 else rsi_14_4h
-                }
-            else:
-                result['longer_term'] = None
+            frames = self.market_data.get_candles_many(
+                [(symbol, '3m', start_time, end_time) for symbol in priced]
+                + [(symbol, '4h', start_time_4h, end_time) for symbol in priced]
+            )
+            candles_3m = dict(zip(priced, frames[:len(priced)]))
+            candles_4h = dict(zip(priced, frames[len(priced):]))
             
-            # Get Open Interest and Funding Rate
+            # Funding rates for every symbol from a single meta request
             try:
                 meta = self.market_data.get_meta()
-                universe = meta.get('universe', [])
-                
-                for asset in universe:
-                    if asset.get('name') == symbol:
-                        # Get funding rate
-                        result['funding_rate'] = float(asset.get('funding', 0))
-                        
-                        # Get open interest (approximation from available data)
-                        # Note: HyperLiquid API may provide this differently
-                        result['open_interest'] = {
-                            'latest': 0,  # Placeholder
-                            'average': 0   # Placeholder
-                        }
-                        break
+                assets = {asset.get('name'): asset for asset in meta.get('universe', [])}
             except Exception as e:
-                self.logger.warning(f"Could not get funding/OI for {symbol}: {e}")
-                result['funding_rate'] = 0
-                result['open_interest'] = {'latest': 0, 'average': 0}
-            
-            return result
-            
+                self.logger.warning(f"Could not get funding/OI: {e}")
+                assets = None
         except Exception as e:
-            self.logger.error(f"Error getting comprehensive data for {symbol}: {e}")
+            self.logger.error(f"Error getting comprehensive market data: {e}")
             return {
-                'symbol': symbol,
-                'available': False,
-                'error': str(e)
+                symbol: {'symbol': symbol, 'available': False, 'error': str(e)}
+                for symbol in symbols
+            }
+        
+        results = {}
+        for symbol in symbols:
+            if symbol not in mids:
+                results[symbol] = {
+                    'symbol': symbol,
+                    'available': False,
+                    'error': 'Price not available'
+                }
+                continue
+            try:
+                results[symbol] = self._build_market_data(
+                    symbol, float(mids[symbol]), candles_3m[symbol], candles_4h[symbol], assets
+                )
+            except Exception as e:
+                self.logger.error(f"Error getting comprehensive data for {symbol}: {e}")
+                results[symbol] = {
+                    'symbol': symbol,
+                    'available': False,
+                    'error': str(e)
+                }
+        return results
+    
+    def _build_market_data(
+        self,
+        symbol: str,
+        current_price: float,
+        df_3m: pd.DataFrame,
+        df_4h: pd.DataFrame,
+        assets: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Compute indicators for one symbol from already fetched data
+        
+        Args:
+            symbol: Trading symbol
+            current_price: Current mid price
+            df_3m: 3-minute candles
+            df_4h: 4-hour candles
+            assets: Exchange universe entries by name, or None if meta failed
+        
+        Returns:
+            Dictionary with all market data and indicators
+        """
+        result = {
+            'symbol': symbol,
+            'available': True,
+            'error': None,
+            'current_price': current_price
+        }
+        
+        if df_3m.empty:
+            result['available'] = False
+            result['error'] = 'Candle data not available'
+            return result
+        
+        # Use all available candles for calculation, but only show last 10 in output
+        prices_3m = df_3m['close'].tolist()
+        
+        # Calculate intraday indicators
+        ema_20_3m = self.calculate_ema(prices_3m, 20)
+        macd_3m = self.calculate_macd(prices_3m)
+        rsi_7_3m = self.calculate_rsi(prices_3m, 7)
+        rsi_14_3m = self.calculate_rsi(prices_3m, 14)
+        
+        result['intraday'] = {
+            'mid_prices': prices_3m[-10:],  # Only last 10 for display
+            'ema_20': ema_20_3m[-10:],
+            'macd': macd_3m[-10:],
+            'rsi_7': rsi_7_3m[-10:],
+            'rsi_14': rsi_14_3m[-10:],
+            'current_ema20': ema_20_3m[-1] if ema_20_3m else np.nan,
+            'current_macd': macd_3m[-1] if macd_3m else np.nan,
+            'current_rsi7': rsi_7_3m[-1] if rsi_7_3m else np.nan
+        }
+        
+        if not df_4h.empty:
+            df_4h = df_4h.tail(40)
+            prices_4h = df_4h['close'].tolist()
+            
+            ema_20_4h = self.calculate_ema(prices_4h, 20)
+            ema_50_4h = self.calculate_ema(prices_4h, 50)
+            atr_3_4h = self.calculate_atr(df_4h, 3)
+            atr_14_4h = self.calculate_atr(df_4h, 14)
+            macd_4h = self.calculate_macd(prices_4h)
+            rsi_14_4h = self.calculate_rsi(prices_4h, 14)
+            
+            # Get last 10 values for arrays
+            result['longer_term'] = {
+                'ema_20': ema_20_4h[-1] if len(ema_20_4h) > 0 else np.nan,
+                'ema_50': ema_50_4h[-1] if len(ema_50_4h) > 0 else np.nan,
+                'atr_3': atr_3_4h[-1] if len(atr_3_4h) > 0 else np.nan,
+                'atr_14': atr_14_4h[-1] if len(atr_14_4h) > 0 else np.nan,
+                'current_volume': df_4h['volume'].iloc[-1] if len(df_4h) > 0 else 0,
+                'avg_volume': df_4h['volume'].mean() if len(df_4h) > 0 else 0,
+                'macd_series': macd_4h[-10:] if len(macd_4h) >= 10 else macd_4h,
+                'rsi_14_series': rsi_14_4h[-10:] if len(rsi_14_4h) >= 10 else rsi_14_4h
             }
+        else:
+            result['longer_term'] = None
+        
+        # Open Interest and Funding Rate
+        if assets is None:
+            result['funding_rate'] = 0
+            result['open_interest'] = {'latest': 0, 'average': 0}
+        elif symbol in assets:
+            # Get funding rate
+            result['funding_rate'] = float(assets[symbol].get('funding', 0))
+            
+            # Get open interest (approximation from available data)
+            # Note: HyperLiquid API may provide this differently
+            result['open_interest'] = {
+                'latest': 0,  # Placeholder
+                'average': 0   # Placeholder
+            }
+        
+        return result
     
     def format_market_data_for_prompt(self, market_data: Dict[str, Any]) -> str:
         """
@@ -252,74 +350,37 @@ class EnhancedMarketDataCollector:
         if not market_data.get('available'):
             return f"ALL {market_data['symbol']} DATA\nData not available: {market_data.get('error', 'Unknown error')}\n"
         
-        symbol = market_data['symbol']
         intraday = market_data.get('intraday', {})
         longer_term = market_data.get('longer_term')
-        
-        # Format current state
-        cp = float(market_data['current_price'])
-        ema20 = float(intraday.get('current_ema20', 0)) if not np.isnan(intraday.get('current_ema20', 0)) else 0
-        macd = float(intraday.get('current_macd', 0)) if not np.isnan(intraday.get('current_macd', 0)) else 0
-        rsi7 = float(intraday.get('current_rsi7', 0)) if not np.isnan(intraday.get('current_rsi7', 0)) else 0
-        
-        output = [
-            f"ALL {symbol} DATA",
-            f"current_price = {cp:.6g}, current_ema20 = {ema20:.6g}, current_macd = {macd:.6g}, current_rsi (7 period) = {rsi7:.6g}",
-            "",
-            f"In addition, here is the latest {symbol} open interest and funding rate for perps:",
-            ""
-        ]
-        
-        # Open Interest
         oi = market_data.get('open_interest', {})
-        output.append(f"Open Interest: Latest: {oi.get('latest', 0):.2f} Average: {oi.get('average', 0):.2f}")
-        output.append("")
-        
-        # Funding Rate
-        output.append(f"Funding Rate: {market_data.get('funding_rate', 0):.6g}")
-        output.append("")
-        
-        # Intraday series
-        output.append("Intraday series (3-minute intervals, oldest → latest):")
-        output.append("")
-        
-        mid_prices = intraday.get('mid_prices', [])
-        output.append(f"{symbol} mid prices: {mid_prices}")
-        output.append("")
-        
-        ema_20 = intraday.get('ema_20', [])
-        output.append(f"EMA indicators (20-period): {[round(x, 3) if not np.isnan(x) else 0 for x in ema_20]}")
-        output.append("")
         
-        macd = intraday.get('macd', [])
-        output.append(f"MACD indicators: {[round(x, 3) if not np.isnan(x) else 0 for x in macd]}")
-        output.append("")
-        
-        rsi_7 = intraday.get('rsi_7', [])
-        output.append(f"RSI indicators (7-Period): {[round(x, 3) if not np.isnan(x) else 0 for x in rsi_7]}")
-        output.append("")
-        
-        rsi_14 = intraday.get('rsi_14', [])
-        output.append(f"RSI indicators (14-Period): {[round(x, 3) if not np.isnan(x) else 0 for x in rsi_14]}")
-        output.append("")
+        text = INTRADAY_PROMPT_TEMPLATE.format_map({
+            'symbol': market_data['symbol'],
+            'current_price': float(market_data['current_price']),
+            'current_ema20': _finite_or_zero(intraday.get('current_ema20', 0)),
+            'current_macd': _finite_or_zero(intraday.get('current_macd', 0)),
+            'current_rsi7': _finite_or_zero(intraday.get('current_rsi7', 0)),
+            'oi_latest': oi.get('latest', 0),
+            'oi_average': oi.get('average', 0),
+            'funding_rate': market_data.get('funding_rate', 0),
+            'mid_prices': intraday.get('mid_prices', []),
+            'ema_20': _round_series(intraday.get('ema_20', [])),
+            'macd': _round_series(intraday.get('macd', [])),
+            'rsi_7': _round_series(intraday.get('rsi_7', [])),
+            'rsi_14': _round_series(intraday.get('rsi_14', [])),
+        })
         
         # Longer-term context
         if longer_term:
-            output.append("Longer-term context (4-hour timeframe):")
-            output.append("")
-            output.append(f"20-Period EMA: {longer_term.get('ema_20', 0):.3f} vs. 50-Period EMA: {longer_term.get('ema_50', 0):.3f}")
-            output.append("")
-            output.append(f"3-Period ATR: {longer_term.get('atr_3', 0):.3f} vs. 14-Period ATR: {longer_term.get('atr_14', 0):.3f}")
-            output.append("")
-            output.append(f"Current Volume: {longer_term.get('current_volume', 0):.3f} vs. Average Volume: {longer_term.get('avg_volume', 0):.3f}")
-            output.append("")
-            
-            macd_series = longer_term.get('macd_series', [])
-            output.append(f"MACD indicators: {[round(x, 3) if not np.isnan(x) else 0 for x in macd_series]}")
-            output.append("")
-            
-            rsi_series = longer_term.get('rsi_14_series', [])
-            output.append(f"RSI indicators (14-Period): {[round(x, 3) if not np.isnan(x) else 0 for x in rsi_series]}")
-            output.append("")
-        
-        return "\n".join(output)
+            text += LONGER_TERM_PROMPT_TEMPLATE.format_map({
+                'ema_20': longer_term.get('ema_20', 0),
+                'ema_50': longer_term.get('ema_50', 0),
+                'atr_3': longer_term.get('atr_3', 0),
+                'atr_14': longer_term.get('atr_14', 0),
+                'current_volume': longer_term.get('current_volume', 0),
+                'avg_volume': longer_term.get('avg_volume', 0),
+                'macd_series': _round_series(longer_term.get('macd_series', [])),
+                'rsi_14_series': _round_series(longer_term.get('rsi_14_series', [])),
+            })
+        
+        return text
@@ -240,7 +240,7 @@ class TechnicalIndicators:
             # ATR
             result_df['atr'] = self.calculate_atr(df, period=config['atr_period'])
             
-            self.logger.debug(f"Calculated all indicators for {len(result_df)} rows")
+            self.logger.debug("Calculated all indicators for %d rows", len(result_df))
             
         except Exception as e:
             self.logger.error(f"Error calculating indicators: {e}")
@@ -2,15 +2,17 @@
 Market data collection module
 """
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
 from ..utils.logger import get_logger
 from ..utils.config_loader import get_config
-from ..utils.constants import ALLOWED_SYMBOLS, LOG_SKIP_UNAVAILABLE, LOG_PRICE_FETCH_FAILED
+from ..utils.constants import ALLOWED_SYMBOLS, ALLOWED_SYMBOLS_SET, LOG_SKIP_UNAVAILABLE, LOG_PRICE_FETCH_FAILED
 
 
 class MarketDataCollector:
@@ -32,12 +34,38 @@ class MarketDataCollector:
         self.api_url = config.get('api_url', constants.MAINNET_API_URL)
         self.info = Info(self.api_url, skip_ws=True)
         
+        # Reuse one pooled keep-alive session for every REST poll so repeated
+        # cycles skip the TCP/TLS handshake. A caller may share its own session.
+        session = config.get('session')
+        if session is not None:
+            self.info.session = session
+        self._configure_session(self.info.session)
+        
         # Whitelist of allowed trading symbols
         self.allowed_symbols = ALLOWED_SYMBOLS
         
+        # Short-lived snapshot of all mid prices: (fetched_at, mids)
+        self._mids_cache = (0.0, None)
+        
+        # Workers for batched candle requests; they share the pooled session
+        self._bulk_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="candles")
+        
         self.logger.info(f"MarketDataCollector initialized with API: {self.api_url}")
         self.logger.info(f"Allowed trading symbols: {self.allowed_symbols}")
     
+    @staticmethod
+    def _configure_session(session) -> None:
+        """
+        Mount a connection pool and request keep-alive on an HTTP session
+        
+        Args:
+            session: requests.Session used by the HyperLiquid Info client
+        """
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+    
     def get_all_mids(self) -> Dict[str, float]:
         """
         Get mid prices for all trading pairs
@@ -47,12 +75,34 @@ class MarketDataCollector:
         """
         try:
             mids = self.info.all_mids()
-            self.logger.debug(f"Retrieved mid prices for {len(mids)} coins")
+            self.logger.debug("Retrieved mid prices for %d coins", len(mids))
             return mids
         except Exception as e:
             self.logger.error(f"Error getting mid prices: {e}")
             return {}
     
+    def get_all_mids_cached(self, ttl: float = 2.0) -> Dict[str, float]:
+        """
+        Get mid prices, reusing the last snapshot if it is fresh enough
+        
+        Several components read mids within the same trading cycle; sharing
+        one snapshot avoids a round trip per caller.
+        
+        Args:
+            ttl: Maximum snapshot age in seconds
+        
+        Returns:
+            Dictionary of coin -> mid price
+        """
+        fetched_at, mids = self._mids_cache
+        if mids is not None and time.monotonic() - fetched_at < ttl:
+            return mids
+        
+        mids = self.get_all_mids()
+        if mids:
+            self._mids_cache = (time.monotonic(), mids)
+        return mids
+    
     def get_l2_book(self, coin: str) -> Dict[str, Any]:
         """
         Get Level 2 order book for a coin
@@ -65,7 +115,7 @@ class MarketDataCollector:
         """
         try:
             book = self.info.l2_snapshot(coin)
-            self.logger.debug(f"Retrieved L2 book for {coin}")
+            self.logger.debug("Retrieved L2 book for %s", coin)
             return book
         except Exception as e:
             self.logger.error(f"Error getting L2 book for {coin}: {e}")
@@ -123,13 +173,58 @@ class MarketDataCollector:
                 df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
                 df.set_index('timestamp', inplace=True)
             
-            self.logger.debug(f"Retrieved {len(df)} candles for {coin} ({interval})")
+            self.logger.debug("Retrieved %d candles for %s (%s)", len(df), coin, interval)
             return df
             
         except Exception as e:
             self.logger.error(f"Error getting candles for {coin}: {e}")
             return pd.DataFrame()
     
+    def get_candles_many(
+        self,
+        queries: Sequence[Tuple[str, str, Optional[int], Optional[int]]]
+    ) -> List[pd.DataFrame]:
+        """
+        Fetch several candle queries concurrently
+        
+        The HyperLiquid candle endpoint takes one coin and interval per
+        request, so the queries are issued in parallel over the pooled
+        keep-alive session rather than one after another.
+        
+        Args:
+            queries: (coin, interval, start_time, end_time) tuples
+        
+        Returns:
+            DataFrames in the same order as the queries (empty on failure)
+        """
+        return list(self._bulk_pool.map(lambda query: self.get_candles(*query), queries))
+    
+    def get_candles_bulk(
+        self,
+        coins: List[str],
+        interval: str = "1m",
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get historical candle data for several coins at once
+        
+        Args:
+            coins: Coin symbols
+            interval: Candle interval (1m, 5m, 15m, 1h, 4h, 1d)
+            start_time: Start timestamp in milliseconds
+            end_time: End timestamp in milliseconds
+        
+        Returns:
+            Dictionary of coin -> OHLCV DataFrame
+        """
+        frames = self.get_candles_many([(coin, interval, start_time, end_time) for coin in coins])
+        return dict(zip(coins, frames))
+    
+    def close(self) -> None:
+        """Stop the candle request workers"""
+        self._bulk_pool.shutdown(wait=False)
+    
     def get_user_state(self, address: str) -> Dict[str, Any]:
         """
         Get user account state
@@ -218,7 +313,7 @@ class MarketDataCollector:
                 startTime=start_time,
                 endTime=end_time
             )
-            self.logger.debug(f"Retrieved funding history for {coin}")
+            self.logger.debug("Retrieved funding history for %s", coin)
             return funding
         except Exception as e:
             self.logger.error(f"Error getting funding history for {coin}: {e}")
@@ -260,7 +355,7 @@ class MarketDataCollector:
             Price as float or None if unavailable
         """
         # Check if symbol is in whitelist
-        if symbol not in self.allowed_symbols:
+        if symbol not in ALLOWED_SYMBOLS_SET:
             self.logger.warning(
                 f"Symbol {symbol} not in allowed list: {self.allowed_symbols}",
                 extra={"event": "symbol_not_allowed", "symbol": symbol}
@@ -4,14 +4,16 @@
 集成每小时新闻搜索和每24小时汇总功能
 """
 
-import json
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
 from openai import OpenAI
 
 from .news_storage import NewsStorage
+from ..utils import json_utils
+from ..utils.http_client import create_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -79,18 +81,35 @@ CRITICAL REMINDERS:
 - Provide forward-looking insights
 - Be objective and balanced in assessment"""
     
-    def __init__(self, api_key: str, storage_dir: str = "news_data"):
+    def __init__(
+        self,
+        api_key: str,
+        storage_dir: str = "news_data",
+        request_timeout: float = 600.0
+    ):
         """
         初始化新闻分析器
         
         Args:
             api_key: Deepseek API密钥
             storage_dir: 新闻数据存储目录
+            request_timeout: 单次请求超时（秒），默认与SDK一致；新闻搜索和每日总结是长文本生成
         """
-        self.client = OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+        # 复用同一个长连接（可用时为HTTP/2）的客户端，避免每次请求重新握手
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url="https://api.deepseek.com",
+            http_client=create_http_client(timeout=request_timeout)
+        )
         self.storage = NewsStorage(storage_dir)
+        # Formatted prompt sections keyed by name -> (storage signature, text)
+        self._prompt_cache: Dict[str, tuple] = {}
         logger.info("NewsAnalyzer initialized")
     
+    def close(self) -> None:
+        """关闭API客户端的连接池"""
+        self.client.close()
+    
     def analyze_hourly_news(self) -> Dict:
         """
         每小时新闻搜索和分析
@@ -120,7 +139,7 @@ CRITICAL REMINDERS:
             
             # 解析JSON
             content = response.choices[0].message.content
-            news_data = json.loads(content)
+            news_data = json_utils.parse_json_object(content)
             
             # 保存到存储
             self.storage.save_hourly_news(news_data, current_time)
@@ -128,7 +147,7 @@ CRITICAL REMINDERS:
             logger.info(f"Hourly news analysis completed: {news_data.get('total_news_found', 0)} news items found")
             return news_data
             
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             logger.error(f"Response content: {content}")
             raise
@@ -176,7 +195,7 @@ CRITICAL REMINDERS:
             
             # 解析JSON
             content = response.choices[0].message.content
-            daily_summary = json.loads(content)
+            daily_summary = json_utils.parse_json_object(content)
             
             # 保存到存储
             self.storage.save_daily_summary(daily_summary, current_time)
@@ -184,7 +203,7 @@ CRITICAL REMINDERS:
             logger.info(f"Daily news analysis completed: {daily_summary.get('total_news_analyzed', 0)} news items analyzed")
             return daily_summary
             
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse JSON response: {e}")
             logger.error(f"Response content: {content}")
             raise
@@ -299,7 +318,7 @@ IMPORTANT:
             f"Sentiment: {news.get('market_sentiment_summary', 'N/A')}\n" +
             f"Key themes: {', '.join(news.get('key_themes', []))}\n" +
             f"News items:\n" +
-            json.dumps(news.get('news_items', []), indent=2)
+            json_utils.dumps(news.get('news_items', []))
             for i, news in enumerate(all_hourly_news)
         ])
         
@@ -412,6 +431,45 @@ TOP IMPORTANT NEWS:
         
         return summary
     
+    @staticmethod
+    def _storage_signature(directory) -> tuple:
+        """
+        目录签名: 当天日期 + 每个文件的名称和修改时间(只做stat,不读取JSON)
+        
+        Args:
+            directory: 存储目录
+            
+        Returns:
+            签名元组,文件新增、删除或改写时变化
+        """
+        try:
+            with os.scandir(directory) as entries:
+                files = sorted((e.name, e.stat().st_mtime_ns) for e in entries if e.is_file())
+        except FileNotFoundError:
+            files = []
+        return (datetime.now().date(), tuple(files))
+    
+    def _cached_prompt_section(self, key: str, directory, build) -> str:
+        """
+        返回缓存的prompt片段,仅在存储目录变化时重新读取并格式化
+        
+        Args:
+            key: 缓存键
+            directory: 片段依赖的存储目录
+            build: 生成片段文本的函数
+            
+        Returns:
+            格式化的文本
+        """
+        signature = self._storage_signature(directory)
+        cached = self._prompt_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        text = build()
+        self._prompt_cache[key] = (signature, text)
+        return text
+    
     def format_today_hourly_news_for_prompt(self) -> str:
         """
         格式化今天所有hourly news为trading prompt格式
@@ -419,6 +477,12 @@ TOP IMPORTANT NEWS:
         Returns:
             格式化的新闻文本,用于注入到trading prompt
         """
+        return self._cached_prompt_section(
+            "today_hourly", self.storage.hourly_dir, self._format_today_hourly_news
+        )
+    
+    def _format_today_hourly_news(self) -> str:
+        """读取并格式化今天所有hourly news"""
         today_news = self.storage.get_today_hourly_news()
         
         if not today_news:
@@ -462,6 +526,13 @@ News Items:"""
         Returns:
             格式化的汇总文本,用于注入到trading prompt
         """
+        return self._cached_prompt_section(
+            f"past_{n}_days", self.storage.daily_dir,
+            lambda: self._format_past_n_days_summaries(n)
+        )
+    
+    def _format_past_n_days_summaries(self, n: int) -> str:
+        """读取并格式化过去N天的daily summaries"""
         summaries = self.storage.get_past_n_days_summaries(n)
         
         if not summaries:
@@ -144,7 +144,7 @@ class NewsStorage:
                 all_news.append(news)
             current += timedelta(hours=1)
         
-        logger.info(f"Retrieved {len(all_news)} hourly news items from {start_time} to {end_time}")
+        logger.info("Retrieved %d hourly news items from %s to %s", len(all_news), start_time, end_time)
         return all_news
     
     def get_daily_summary(self, date: datetime) -> Optional[Dict]:
@@ -236,7 +236,7 @@ class NewsStorage:
             if summary:
                 summaries.append(summary)
         
-        logger.info(f"Retrieved {len(summaries)} daily summaries from past {n} days")
+        logger.info("Retrieved %d daily summaries from past %d days", len(summaries), n)
         return summaries
     
     def archive_old_news(self, days_to_keep: int = 7):
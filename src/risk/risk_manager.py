@@ -44,7 +44,11 @@ class RiskManager:
         self.daily_pnl = 0
         self.daily_reset_time = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         self.positions: Dict[str, Dict[str, Any]] = {}
+        # Running sum of size * entry_price, kept in step with positions
+        self.total_position_value = 0.0
         self.trading_enabled = True
+        # Metrics snapshot, reset by every method that changes the state above
+        self._metrics_cache: Optional[Dict[str, Any]] = None
         
         self.logger.info("RiskManager initialized")
     
@@ -58,6 +62,7 @@ class RiskManager:
         self.initial_capital = capital
         self.current_capital = capital
         self.peak_capital = capital
+        self._metrics_cache = None
         self.logger.info(f"Capital initialized: ${capital:,.2f}")
     
     def update_capital(self, capital: float):
@@ -68,6 +73,7 @@ class RiskManager:
             capital: Current capital amount
         """
         self.current_capital = capital
+        self._metrics_cache = None
         
         if not self.enforce_limits:
             self.trading_enabled = True
@@ -119,6 +125,7 @@ class RiskManager:
             self.daily_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         self.daily_pnl = pnl
+        self._metrics_cache = None
         
         # Check limit
         loss_pct = abs(pnl) / self.initial_capital if pnl < 0 else 0
@@ -248,11 +255,7 @@ class RiskManager:
             return False, f"Position size ${position_value:.2f} exceeds limit ${max_position_value:.2f}"
         
         # Check total position limit
-        total_position_value = sum(
-            pos.get('size', 0) * pos.get('entry_price', 0)
-            for pos in self.positions.values()
-        )
-        total_position_value += position_value
+        total_position_value = self.total_position_value + position_value
         
         max_total_value = self.current_capital * self.max_total_position
         if total_position_value > max_total_value:
@@ -278,6 +281,11 @@ class RiskManager:
             is_long: True for long, False for short
             leverage: Leverage used
         """
+        previous = self.positions.get(coin)
+        if previous is not None:
+            self.total_position_value -= previous['size'] * previous['entry_price']
+        self.total_position_value += size * entry_price
+        self._metrics_cache = None
         self.positions[coin] = {
             'size': size,
             'entry_price': entry_price,
@@ -300,8 +308,14 @@ class RiskManager:
         Args:
             coin: Coin symbol
         """
-        if coin in self.positions:
-            del self.positions[coin]
+        position = self.positions.pop(coin, None)
+        if position is not None:
+            if self.positions:
+                self.total_position_value -= position['size'] * position['entry_price']
+            else:
+                # Reset exactly rather than carry float residue
+                self.total_position_value = 0.0
+            self._metrics_cache = None
             self.logger.info(f"Position removed: {coin}")
     
     def update_position(self, coin: str, current_price: float) -> Optional[str]:
@@ -345,19 +359,21 @@ class RiskManager:
         """
         Get current risk metrics
         
+        The snapshot is rebuilt only after capital or positions change;
+        callers receive their own copy.
+        
         Returns:
             Dictionary of risk metrics
         """
-        return {
-            'initial_capital': self.initial_capital,
-            'current_capital': self.current_capital,
-            'peak_capital': self.peak_capital,
-            'drawdown': self.calculate_drawdown(),
-            'daily_pnl': self.daily_pnl,
-            'num_positions': len(self.positions),
-            'trading_enabled': self.trading_enabled,
-            'total_position_value': sum(
-                pos.get('size', 0) * pos.get('entry_price', 0)
-                for pos in self.positions.values()
-            )
-        }
+        if self._metrics_cache is None:
+            self._metrics_cache = {
+                'initial_capital': self.initial_capital,
+                'current_capital': self.current_capital,
+                'peak_capital': self.peak_capital,
+                'drawdown': self.calculate_drawdown(),
+                'daily_pnl': self.daily_pnl,
+                'num_positions': len(self.positions),
+                'trading_enabled': self.trading_enabled,
+                'total_position_value': self.total_position_value
+            }
+        return dict(self._metrics_cache)
@@ -102,7 +102,7 @@ class AITradingStrategy:
         """
         try:
             # Get current market data
-            mids = self.market_data.get_all_mids()
+            mids = self.market_data.get_all_mids_cached()
             current_price = self._safe_float(mids.get(coin, 0))
             
             if current_price == 0:
@@ -1,6 +1,7 @@
 """
 Trading execution module
 """
+import threading
 from typing import Dict, List, Optional, Any
 from hyperliquid.exchange import Exchange
 from hyperliquid.utils import constants
@@ -68,6 +69,8 @@ class TradeExecutor:
         self.paper_orders: List[Dict[str, Any]] = []
         self.paper_positions: Dict[str, Dict[str, Any]] = {}
         self.next_order_id = 1
+        # Orders may be placed from several execution threads at once
+        self._paper_lock = threading.Lock()
     
     def place_order(
         self,
@@ -130,6 +133,72 @@ class TradeExecutor:
             self.logger.error(f"Error placing order: {e}")
             return {"status": "error", "error": str(e)}
     
+    def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several orders in a single exchange request
+        
+        Args:
+            orders: Order dictionaries with place_order's keyword arguments
+                (coin, is_buy, size, and optionally price, order_type, tif,
+                reduce_only, leverage)
+        
+        Returns:
+            One result per order, in the same order, shaped like place_order's
+        """
+        if not orders:
+            return []
+        
+        if self.paper_trading:
+            return [self.place_order(**order) for order in orders]
+        
+        try:
+            # Leverage is a per-coin account setting, not part of the order
+            for order in orders:
+                if order.get('leverage') is not None:
+                    self._update_leverage(order['coin'], order['leverage'])
+            
+            requests = [
+                {
+                    "coin": order['coin'],
+                    "is_buy": order['is_buy'],
+                    "sz": order['size'],
+                    "limit_px": order.get('price') or 0,
+                    "order_type": {"limit": {"tif": order.get('tif', TimeInForce.GTC)}},
+                    "reduce_only": order.get('reduce_only', False),
+                }
+                for order in orders
+            ]
+            
+            # Execute all orders in one signed bulk request
+            result = self.exchange.bulk_orders(requests)
+            
+            if result.get('status') != 'ok':
+                error = str(result.get('response', 'Unknown error'))
+                return [{"status": "error", "error": error} for _ in orders]
+            
+            statuses = result.get('response', {}).get('data', {}).get('statuses', [])
+            results = []
+            for order, status in zip(orders, statuses):
+                if isinstance(status, dict) and 'error' in status:
+                    results.append({"status": "error", "error": status['error']})
+                else:
+                    results.append({
+                        "status": "ok",
+                        "response": {"type": "order", "data": {"statuses": [status]}}
+                    })
+            # The exchange reports one status per order; treat gaps as failures
+            results.extend(
+                {"status": "error", "error": "No status returned"}
+                for _ in orders[len(results):]
+            )
+            
+            self.logger.info(f"Batch placed: {len(orders)} orders")
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error placing order batch: {e}")
+            return [{"status": "error", "error": str(e)} for _ in orders]
+    
     def cancel_order(self, coin: str, order_id: int) -> Dict[str, Any]:
         """
         Cancel an order
@@ -280,8 +349,9 @@ class TradeExecutor:
         leverage: Optional[int]
     ) -> Dict[str, Any]:
         """Place a simulated paper order"""
-        order_id = self.next_order_id
-        self.next_order_id += 1
+        with self._paper_lock:
+            order_id = self.next_order_id
+            self.next_order_id += 1
         
         order = {
             "order_id": order_id,
@@ -296,7 +366,8 @@ class TradeExecutor:
             "status": "open"
         }
         
-        self.paper_orders.append(order)
+        with self._paper_lock:
+            self.paper_orders.append(order)
         
         self.logger.info(
             f"[PAPER] Order placed: {coin} {'BUY' if is_buy else 'SELL'} "
@@ -1,14 +1,23 @@
 """
 Main trading bot orchestrator
 """
+import logging
+import signal
+import threading
 import time
-import json
+import csv
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+import numpy as np
 
 from .utils.logger import get_logger
 from .utils.config_loader import get_config
+from .utils import json_utils
 from .data.market_data import MarketDataCollector, MarketDataCache
 from .data.indicators import TechnicalIndicators
 from .data.enhanced_market_data import EnhancedMarketDataCollector
@@ -21,6 +30,35 @@ from .strategy.ai_strategy import AITradingStrategy
 
 EQUITY_LOG_HEADER = "timestamp,capital,unrealized_pnl,realized_pnl,drawdown,num_positions,total_position_value\n"
 JOURNAL_LOG_HEADER = "timestamp,capital,unrealized_pnl,realized_pnl,num_positions,positions,details\n"
+# Closed trades kept in memory; the full history goes to the daily trade logs
+TRADE_HISTORY_MAXLEN = 10_000
+# Final statistics rows: left-aligned label column, right-aligned value column
+STATISTICS_ROW_FORMAT = "{:<18}{:>20}"
+# Report dividers
+SECTION_RULE = "=" * 60
+CYCLE_RULE = "-" * 60
+
+
+class Trade(NamedTuple):
+    """A closed trade (a tuple, so a long history stays compact in memory)"""
+    coin: str
+    entry_time: datetime
+    exit_time: datetime
+    entry_price: float
+    exit_price: float
+    size: float
+    is_long: bool
+    pnl: float
+    reason: str
+
+
+# Trade log columns, in Trade field order
+TRADE_LOG_FIELDS = Trade._fields
+
+
+def _usd(value: float) -> str:
+    """Format a dollar amount with thousands separators and cents (no '$')."""
+    return format(value, ',.2f')
 
 
 class TradingBot:
@@ -45,9 +83,7 @@ class TradingBot:
             log_file=log_config.get('log_file')
         )
         
-        self.logger.info("=" * 60)
-        self.logger.info("Initializing HyperLiquid AI Trading Bot")
-        self.logger.info("=" * 60)
+        self.logger.info("%s\nInitializing HyperLiquid AI Trading Bot\n%s", SECTION_RULE, SECTION_RULE)
         
         # Initialize components
         self.market_data = MarketDataCollector(
@@ -73,7 +109,8 @@ class TradingBot:
             try:
                 self.news_analyzer = NewsAnalyzer(
                     api_key=self.config.get('deepseek.api_key'),
-                    storage_dir=news_config.get('news_data_dir', 'news_data')
+                    storage_dir=news_config.get('news_data_dir', 'news_data'),
+                    request_timeout=news_config.get('request_timeout', 600.0)
                 )
                 self.logger.info("News integration enabled")
             except Exception as e:
@@ -102,27 +139,57 @@ class TradingBot:
         self._cleanup_historical_data()
         
         # Trading state
-        self.trading_pairs = self.config.get('trading.trading_pairs', [])
+        self.trading_pairs = tuple(self.config.get('trading.trading_pairs', []))
+        self._trading_pairs_set = frozenset(self.trading_pairs)
+        # Order placement is network-bound; candidates execute off the
+        # trading loop and are waited for at the end of each cycle
+        self._execution_pool = ThreadPoolExecutor(
+            max_workers=max(1, self.config.get('trading.execution_workers', 4)),
+            thread_name_prefix="order-exec"
+        )
+        # Guards positions, trade history, PnL counters and journal writes
+        self._state_lock = threading.RLock()
         self.trading_interval = max(self.config.get('trading.trading_interval', 300), 300)
         self.is_running = False
+        self._stop_event = threading.Event()
+        self._stopped = False
         self.positions: Dict[str, Dict[str, Any]] = {}
-        self.trade_history: List[Dict[str, Any]] = []
+        self.trade_history: deque = deque(maxlen=TRADE_HISTORY_MAXLEN)
         self.realized_pnl = 0.0
+        # Clock snapshot shared by everything logged within one trading cycle
+        self._cycle_now: Optional[datetime] = None
+        self._cycle_iso: Optional[str] = None
+        # Rolling trade counters so reports never rescan trade_history
+        self._trade_stats = {"opened": 0, "closed": 0, "wins": 0}
         self.last_prices: Dict[str, float] = {}
+        # Risk metrics snapshot, reset whenever positions or capital change
+        self._metrics_cache: Optional[Dict[str, Any]] = None
+        # Position columns (coins, entries, sizes, signed leverage) for the
+        # vectorized PnL; rebuilt only after a position opens or closes
+        self._position_arrays_cache: Optional[tuple] = None
         if not self.equity_log_path.exists():
             self.equity_log_path.write_text(EQUITY_LOG_HEADER, encoding="utf-8")
         if not self.journal_path.exists():
             self.journal_path.write_text(JOURNAL_LOG_HEADER, encoding="utf-8")
+        # Persistent buffered append handles; flushed once per trading cycle
+        self._equity_fp = open(self.equity_log_path, "a", buffering=1 << 16, encoding="utf-8")
+        self._journal_fp = open(self.journal_path, "a", buffering=1 << 16, encoding="utf-8")
+        # Daily trade log (logs/trades_YYYY-MM-DD.csv), opened on the first close
+        self._trade_log_date: Optional[date] = None
+        self._trade_log_fp = None
+        self._trade_writer = None
         
         # Initialize capital
         initial_capital = self.config.get('trading.initial_capital', 10000)
         self.initial_capital_value = initial_capital
+        # Constant for the whole run, so format it once for the reports
+        self._initial_capital_str = f"${_usd(initial_capital)}"
         self.risk_manager.initialize_capital(initial_capital)
         
         self.logger.info("Trading Bot initialized successfully")
         self.logger.info(f"Trading pairs: {', '.join(self.trading_pairs)}")
         self.logger.info(f"Trading mode: {self.config.get('trading.mode')}")
-        self.logger.info(f"Initial capital: ${initial_capital:,.2f}")
+        self.logger.info("Initial capital: %s", self._initial_capital_str)
 
     def _cleanup_historical_data(self) -> None:
         """Remove stale log/news data on startup."""
@@ -165,17 +232,22 @@ class TradingBot:
         unrealized = 0.0
         total_position_value = 0.0
 
-        for coin, position in self.positions.items():
-            current_price = self._extract_price(prices.get(coin, position['entry_price']), position['entry_price'])
-            entry_price = position['entry_price']
-            size = position['size']
-            leverage = position.get('leverage', 1)
-            total_position_value += size * current_price
-
-            price_diff = current_price - entry_price
-            if not position.get('is_long', True):
-                price_diff = entry_price - current_price
-            unrealized += price_diff * size * leverage
+        if self.positions:
+            # One vectorized pass over all positions; only current prices vary
+            coins, entries, sizes, signed_leverages = self._position_arrays()
+            # Bound once: the generator below runs per position on every call
+            extract_price = self._extract_price
+            price_of = prices.get
+            currents = np.fromiter(
+                (
+                    extract_price(price_of(coin, entry), entry)
+                    for coin, entry in zip(coins, entries.tolist())
+                ),
+                dtype=np.float64,
+                count=len(coins)
+            )
+            unrealized = float(((currents - entries) * sizes * signed_leverages).sum())
+            total_position_value = float((sizes * currents).sum())
 
         capital = self.initial_capital_value + self.realized_pnl + unrealized
         return {
@@ -184,19 +256,43 @@ class TradingBot:
             "total_position_value": total_position_value,
         }
 
+    def _position_arrays(self) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray, np.ndarray]:
+        """Return position columns, rebuilding them only after positions change."""
+        if self._position_arrays_cache is None:
+            positions = self.positions
+            values = tuple(positions.values())
+            count = len(values)
+            entries = np.fromiter((p['entry_price'] for p in values), dtype=np.float64, count=count)
+            sizes = np.fromiter((p['size'] for p in values), dtype=np.float64, count=count)
+            # Short PnL is long PnL negated, so fold the side into the leverage
+            signed_leverages = np.fromiter(
+                (
+                    p.get('leverage', 1) * (1.0 if p.get('is_long', True) else -1.0)
+                    for p in values
+                ),
+                dtype=np.float64,
+                count=count
+            )
+            self._position_arrays_cache = (tuple(positions), entries, sizes, signed_leverages)
+        return self._position_arrays_cache
+
+    def _positions_changed(self) -> None:
+        """Invalidate caches derived from the open positions."""
+        self._metrics_cache = None
+        self._position_arrays_cache = None
+
     def _append_equity_log(self, metrics: Dict[str, Any]) -> None:
         """Write a row to the equity CSV."""
         try:
-            with open(self.equity_log_path, "a", encoding="utf-8") as fp:
-                fp.write(
-                    f"{datetime.now().isoformat()},"
-                    f"{metrics['capital']},"
-                    f"{metrics['unrealized']},"
-                    f"{self.realized_pnl},"
-                    f"{self.risk_manager.calculate_drawdown()},"
-                    f"{len(self.positions)},"
-                    f"{metrics['total_position_value']}\n"
-                )
+            self._equity_fp.write(
+                f"{self._now_iso()},"
+                f"{metrics['capital']},"
+                f"{metrics['unrealized']},"
+                f"{self.realized_pnl},"
+                f"{self._risk_metrics()['drawdown']},"
+                f"{len(self.positions)},"
+                f"{metrics['total_position_value']}\n"
+            )
         except Exception as exc:
             self.logger.error(f"Failed to append equity log: {exc}")
 
@@ -204,9 +300,24 @@ class TradingBot:
         """Refresh risk metrics and persist equity snapshot."""
         metrics = self._calculate_portfolio_value(prices)
         self.risk_manager.update_capital(metrics['capital'])
+        self._metrics_cache = None
         self._append_equity_log(metrics)
         return metrics
 
+    def _now(self) -> datetime:
+        """Return the current cycle's timestamp, or a fresh one outside a cycle."""
+        return self._cycle_now or datetime.now()
+
+    def _now_iso(self) -> str:
+        """Return the current cycle's timestamp as ISO text, formatted once per cycle."""
+        return self._cycle_iso or datetime.now().isoformat()
+
+    def _risk_metrics(self) -> Dict[str, Any]:
+        """Return risk metrics, recomputing only after positions or capital change."""
+        if self._metrics_cache is None:
+            self._metrics_cache = self.risk_manager.get_risk_metrics()
+        return self._metrics_cache
+
     def _positions_snapshot(self) -> Dict[str, Dict[str, Any]]:
         """Return a simplified snapshot of current positions."""
         return {
@@ -223,34 +334,95 @@ class TradingBot:
 
     def _log_journal(self, event_type: str, details: Dict[str, Any], metrics: Optional[Dict[str, float]] = None) -> None:
         """Append a structured entry to the trading journal."""
-        if metrics is None:
-            metrics = self._calculate_portfolio_value(self.last_prices)
-        try:
-            with open(self.journal_path, "a", encoding="utf-8") as fp:
-                fp.write(
-                    f"{datetime.now().isoformat()},"
+        # Rows are written from order execution threads; keep each one whole
+        with self._state_lock:
+            if metrics is None:
+                metrics = self._calculate_portfolio_value(self.last_prices)
+            try:
+                self._journal_fp.write(
+                    f"{self._now_iso()},"
                     f"{metrics['capital']},"
                     f"{metrics['unrealized']},"
                     f"{self.realized_pnl},"
                     f"{len(self.positions)},"
-                    f"\"{json.dumps(self._positions_snapshot(), ensure_ascii=False)}\","
-                    f"\"{json.dumps(details, ensure_ascii=False)}\"\n"
+                    f"\"{json_utils.dumps(self._positions_snapshot())}\","
+                    f"\"{json_utils.dumps(details)}\"\n"
                 )
+            except Exception as exc:
+                self.logger.warning(f"Failed to log journal entry: {exc}")
+
+    def _append_trade_log(self, trade: Trade) -> None:
+        """Append a closed trade to the current day's trade log."""
+        try:
+            day = trade.exit_time.date()
+            if day != self._trade_log_date:
+                # Rotate to a new file when the day changes
+                if self._trade_log_fp is not None:
+                    self._trade_log_fp.close()
+                path = self.log_dir / f"trades_{day.isoformat()}.csv"
+                is_new = not path.exists()
+                self._trade_log_fp = open(path, "a", buffering=1 << 16, encoding="utf-8", newline="")
+                self._trade_writer = csv.writer(self._trade_log_fp)
+                self._trade_log_date = day
+                if is_new:
+                    self._trade_writer.writerow(TRADE_LOG_FIELDS)
+            self._trade_writer.writerow(trade._replace(
+                entry_time=trade.entry_time.isoformat(),
+                exit_time=trade.exit_time.isoformat(),
+            ))
         except Exception as exc:
-            self.logger.warning(f"Failed to log journal entry: {exc}")
+            self.logger.error(f"Failed to append trade log: {exc}")
+
+    def _flush_logs(self) -> None:
+        """Flush buffered equity, journal, trade and AI dialog rows to disk."""
+        for fp in (self._equity_fp, self._journal_fp, self._trade_log_fp):
+            if fp is not None and not fp.closed:
+                fp.flush()
+        self.ai_agent.flush_logs()
+
+    def _close_logs(self) -> None:
+        """Flush and close the persistent log handles."""
+        self._equity_fp.close()
+        self._journal_fp.close()
+        if self._trade_log_fp is not None:
+            self._trade_log_fp.close()
+        self.ai_agent.close()
+        if self.news_analyzer:
+            self.news_analyzer.close()
 
     def start(self):
         """Start the trading bot"""
         self.logger.info("Starting trading bot...")
         self.is_running = True
+        self._stopped = False
+        self._stop_event.clear()
+        self._install_signal_handlers()
         
         # Fetch news from the past hour before starting
         self._fetch_startup_news()
         
         try:
-            while self.is_running:
+            next_run = time.monotonic()
+            while self.is_running and not self._stop_event.is_set():
                 self._trading_loop()
-                time.sleep(self.trading_interval)
+                
+                # Sleep until the next cycle is due rather than a fixed interval
+                # after the work finished; stop() wakes the wait immediately
+                next_run += self.trading_interval
+                now = time.monotonic()
+                if next_run <= now:
+                    # Overran one or more slots: skip them instead of bursting
+                    missed = int((now - next_run) // self.trading_interval) + 1
+                    next_run += missed * self.trading_interval
+                    self.logger.warning("Trading cycle overran; skipping %d missed slot(s)", missed)
+                
+                sleep_seconds = next_run - now
+                next_run_at = datetime.now() + timedelta(seconds=sleep_seconds)
+                self.logger.info("Next trading cycle at %s", next_run_at.strftime("%Y-%m-%d %H:%M:%S"))
+                self._stop_event.wait(timeout=sleep_seconds)
+            
+            # Loop left via a stop signal: shut down cleanly
+            self.stop()
         except KeyboardInterrupt:
             self.logger.info("Received stop signal")
             self.stop()
@@ -258,10 +430,34 @@ class TradingBot:
             self.logger.error(f"Fatal error in trading loop: {e}", exc_info=True)
             self.stop()
     
+    def _install_signal_handlers(self):
+        """
+        Turn SIGINT/SIGTERM into a stop request instead of an exception
+        
+        With siginterrupt disabled, in-flight socket calls are restarted rather
+        than failing with EINTR; the loop then exits at the next stop check.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._handle_stop_signal)
+            if hasattr(signal, "siginterrupt"):
+                signal.siginterrupt(sig, False)
+    
+    def _handle_stop_signal(self, signum, frame):
+        """Request shutdown from a signal handler"""
+        self.logger.info(f"Received stop signal ({signal.Signals(signum).name})")
+        self.is_running = False
+        self._stop_event.set()
+    
     def stop(self):
         """Stop the trading bot"""
+        if self._stopped:
+            return
+        self._stopped = True
         self.logger.info("Stopping trading bot...")
         self.is_running = False
+        self._stop_event.set()
         
         # Close all positions
         self._close_all_positions()
@@ -269,14 +465,25 @@ class TradingBot:
         # Print final statistics
         self._print_statistics()
         
+        self.market_data.close()
+        self._execution_pool.shutdown(wait=True)
+        self._close_logs()
+        
         self.logger.info("Trading bot stopped")
+        # Drain queued log records before the process exits
+        self.logger.stop()
     
     def _trading_loop(self):
         """Main trading loop iteration - Single AI call for all symbols"""
+        self._cycle_now = datetime.now()
+        self._cycle_iso = self._cycle_now.isoformat()
+        pending: List[Future] = []
         try:
-            self.logger.info("-" * 60)
-            self.logger.info(f"Trading loop iteration at {datetime.now()}")
-            self.logger.info("[ORCHESTRATOR MODE] Calling AI once for all symbols")
+            self.logger.info(
+                "%s\nTrading loop iteration at %s\n"
+                "[ORCHESTRATOR MODE] Calling AI once for all symbols",
+                CYCLE_RULE, self._cycle_now
+            )
             
             # Update account state
             self._update_account_state()
@@ -288,23 +495,42 @@ class TradingBot:
             
             # Collect market data for all symbols
             all_market_data = self._collect_all_market_data()
+            if self._stop_event.is_set():
+                return
+            # Nothing to trade on: skip the AI round trip entirely
+            if not all_market_data['market_data']:
+                self.logger.warning("No market data for any symbol, skipping AI call this cycle")
+                return
             self.last_prices = {
                 coin: data.get('current_price')
                 for coin, data in all_market_data['market_data'].items()
                 if data.get('current_price') is not None
             }
             
-            # Get trading plan for all symbols in one AI call
+            # Get trading plan for all symbols in one AI call; with streaming,
+            # candidates are executed as soon as each one is complete
+            streamed_symbols = set()
+            
+            def execute_streamed(candidate: Dict[str, Any]):
+                if self._stop_event.is_set():
+                    return
+                streamed_symbols.add(candidate.get('symbol'))
+                pending.append(self._execution_pool.submit(self._execute_candidate, candidate))
+            
             trading_plan = self.ai_agent.generate_trading_plan(
                 market_data=all_market_data['market_data'],
                 current_positions=self.positions,
                 unavailable_symbols=all_market_data['unavailable'],
                 news_summary="",
-                orders=self._get_recent_orders()
+                orders=self._get_recent_orders(),
+                on_candidate=execute_streamed
             )
+            if self._stop_event.is_set():
+                return
             
-            # Execute trading plan
-            self._execute_trading_plan(trading_plan)
+            # Execute whatever was not already handled while streaming
+            pending.extend(self._execute_trading_plan(trading_plan, skip_symbols=streamed_symbols))
+            wait(pending)
             metrics = self._update_equity_metrics(self.last_prices)
             self._log_journal("ai_plan", trading_plan, metrics)
             
@@ -312,7 +538,16 @@ class TradingBot:
             self._log_current_state()
             
         except Exception as e:
-            self.logger.error(f"Error in trading loop: {e}", exc_info=True)
+            # The next cycle retries, so a recurring error logs one line per
+            # cycle; full tracebacks are kept for fatal errors that end start()
+            self.logger.error("Error in trading loop: %r", e)
+        finally:
+            # Never leave orders in flight past the end of the cycle
+            if pending:
+                wait(pending)
+            self._cycle_now = None
+            self._cycle_iso = None
+            self._flush_logs()
     
     def _process_coin(self, coin: str):
         """
@@ -322,7 +557,7 @@ class TradingBot:
             coin: Coin symbol
         """
         try:
-            self.logger.debug(f"Processing {coin}...")
+            self.logger.debug("Processing %s...", coin)
             
             # Get current position
             current_position = self.positions.get(coin)
@@ -333,233 +568,142 @@ class TradingBot:
             action = decision.get('action', 'hold')
             
             self.logger.info(
-                f"{coin}: Action={action.upper()}, "
-                f"Reason={decision.get('reason', 'N/A')}"
+                "%s: Action=%s, Reason=%s",
+                coin, action.upper(), decision.get('reason', 'N/A')
             )
             
             # Execute action
-            if action == 'buy':
-                self._execute_buy(coin, decision)
-            elif action == 'sell':
-                self._execute_sell(coin, decision)
+            if action in ('buy', 'sell'):
+                self._execute_order(coin, decision, is_long=(action == 'buy'))
             elif action == 'close':
                 self._execute_close(coin, decision)
             
         except Exception as e:
             self.logger.error(f"Error processing {coin}: {e}")
     
-    def _execute_buy(self, coin: str, decision: Dict[str, Any]):
-        """Execute buy order"""
-        try:
-            size = decision.get('size', 0)
-            price = self._extract_price(decision.get('entry_price', 0))
-            leverage = decision.get('leverage') or self.risk_manager.default_leverage or 1
-            if not isinstance(leverage, (int, float)) or leverage <= 0:
-                leverage = self.risk_manager.default_leverage or 1
-            stop_loss = self._extract_price(decision.get('stop_loss', 0))
-            take_profit_raw = decision.get('take_profit', 0)
-            take_profit = self._extract_price(take_profit_raw)
-            take_profit_targets = (
-                list(take_profit_raw)
-                if isinstance(take_profit_raw, (list, tuple))
-                else [take_profit]
+    def _execute_order(self, coin: str, decision: Dict[str, Any], is_long: bool):
+        """
+        Execute an opening order in either direction
+        
+        Args:
+            coin: Coin symbol
+            decision: Decision dictionary (entry_price, size, leverage, SL/TP, reason)
+            is_long: True to buy (open long), False to sell (open short)
+        """
+        action = 'buy' if is_long else 'sell'
+        label = action.upper()
+        size = decision.get('size', 0)
+        price = self._extract_price(decision.get('entry_price', 0))
+        leverage = decision.get('leverage') or self.risk_manager.default_leverage or 1
+        if not isinstance(leverage, (int, float)) or leverage <= 0:
+            leverage = self.risk_manager.default_leverage or 1
+        stop_loss = self._extract_price(decision.get('stop_loss', 0))
+        take_profit_raw = decision.get('take_profit', 0)
+        take_profit = self._extract_price(take_profit_raw)
+        take_profit_targets = (
+            list(take_profit_raw)
+            if isinstance(take_profit_raw, (list, tuple))
+            else [take_profit]
+        )
+        market_price = self.last_prices.get(coin)
+        if price <= 0 and market_price:
+            self.logger.warning(
+                "%s: Replacing invalid %s entry price with market price %s", coin, action, market_price
             )
-            market_price = self.last_prices.get(coin)
-            if price <= 0 and market_price:
-                self.logger.warning(
-                    f"{coin}: Replacing invalid buy entry price with market price {market_price}"
-                )
-                price = market_price
-            if price <= 0:
-                self.logger.error(
-                    f"{coin}: Cannot execute buy order due to missing price information"
-                )
-                self._log_journal(
-                    "order_error",
-                    {
-                        "coin": coin,
-                        "action": "buy",
-                        "error": "Missing entry price",
-                        "decision": decision,
-                    }
-                )
-                return
-            
-            # Place order
-            result = self.executor.place_order(
-                coin=coin,
-                is_buy=True,
-                size=size,
-                price=price,
-                leverage=leverage
+            price = market_price
+        if price <= 0:
+            self.logger.error(
+                f"{coin}: Cannot execute {action} order due to missing price information"
             )
-            
-            if result.get('status') == 'ok':
-                # Add position to risk manager
-                self.risk_manager.add_position(
-                    coin=coin,
-                    size=size,
-                    entry_price=price,
-                    is_long=True,
-                    leverage=leverage
-                )
-                
-                # Track position
-                self.positions[coin] = {
-                    'coin': coin,
-                    'size': size,
-                    'entry_price': price,
-                    'is_long': True,
-                    'leverage': leverage,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'take_profit_targets': take_profit_targets,
-                    'entry_time': datetime.now()
+            self._log_journal(
+                "order_error",
+                {
+                    "coin": coin,
+                    "action": action,
+                    "error": "Missing entry price",
+                    "decision": decision,
                 }
-                
-                self.logger.info(
-                    f"BUY order executed: {coin} {size} @ ${price:.2f} "
-                    f"(leverage: {leverage}x, SL: ${stop_loss:.2f}, TP: ${take_profit:.2f})"
-                )
-                self._log_journal(
-                    "order_fill",
-                    {
-                        "coin": coin,
-                        "action": "buy",
-                        "size": size,
-                        "entry_price": price,
-                        "leverage": leverage,
-                        "stop_loss": stop_loss,
-                        "take_profit_targets": take_profit_targets,
-                        "reason": decision.get('reason'),
-                    }
-                )
-            else:
-                self.logger.error(f"BUY order failed: {result.get('error', 'Unknown error')}")
-                self._log_journal(
-                    "order_error",
-                    {
-                        "coin": coin,
-                        "action": "buy",
-                        "error": result.get('error', 'Unknown error'),
-                        "decision": decision,
-                    }
-                )
-                
-        except Exception as e:
-            self.logger.error(f"Error executing buy order: {e}")
-    
-    def _execute_sell(self, coin: str, decision: Dict[str, Any]):
-        """Execute sell order"""
-        try:
-            size = decision.get('size', 0)
-            price = self._extract_price(decision.get('entry_price', 0))
-            leverage = decision.get('leverage') or self.risk_manager.default_leverage or 1
-            if not isinstance(leverage, (int, float)) or leverage <= 0:
-                leverage = self.risk_manager.default_leverage or 1
-            stop_loss = self._extract_price(decision.get('stop_loss', 0))
-            take_profit_raw = decision.get('take_profit', 0)
-            take_profit = self._extract_price(take_profit_raw)
-            take_profit_targets = (
-                list(take_profit_raw)
-                if isinstance(take_profit_raw, (list, tuple))
-                else [take_profit]
             )
-            market_price = self.last_prices.get(coin)
-            if price <= 0 and market_price:
-                self.logger.warning(
-                    f"{coin}: Replacing invalid sell entry price with market price {market_price}"
-                )
-                price = market_price
-            if price <= 0:
-                self.logger.error(
-                    f"{coin}: Cannot execute sell order due to missing price information"
-                )
-                self._log_journal(
-                    "order_error",
-                    {
-                        "coin": coin,
-                        "action": "sell",
-                        "error": "Missing entry price",
-                        "decision": decision,
-                    }
-                )
-                return
-            
-            # Place order
+            return
+        
+        # Place order; only the exchange round trip is expected to raise
+        try:
             result = self.executor.place_order(
                 coin=coin,
-                is_buy=False,
+                is_buy=is_long,
                 size=size,
                 price=price,
                 leverage=leverage
             )
-            
-            if result.get('status') == 'ok':
+        except Exception as e:
+            self.logger.error(f"Error executing {action} order: {e}")
+            return
+        
+        if result.get('status') == 'ok':
+            with self._state_lock:
                 # Add position to risk manager
                 self.risk_manager.add_position(
                     coin=coin,
                     size=size,
                     entry_price=price,
-                    is_long=False,
+                    is_long=is_long,
                     leverage=leverage
                 )
+                self._positions_changed()
+                self._trade_stats["opened"] += 1
                 
                 # Track position
                 self.positions[coin] = {
                     'coin': coin,
                     'size': size,
                     'entry_price': price,
-                    'is_long': False,
+                    'is_long': is_long,
                     'leverage': leverage,
                     'stop_loss': stop_loss,
                     'take_profit': take_profit,
                     'take_profit_targets': take_profit_targets,
-                    'entry_time': datetime.now()
+                    'entry_time': self._now()
                 }
-                
-                self.logger.info(
-                    f"SELL order executed: {coin} {size} @ ${price:.2f} "
-                    f"(leverage: {leverage}x, SL: ${stop_loss:.2f}, TP: ${take_profit:.2f})"
-                )
-                self._log_journal(
-                    "order_fill",
-                    {
-                        "coin": coin,
-                        "action": "sell",
-                        "size": size,
-                        "entry_price": price,
-                        "leverage": leverage,
-                        "stop_loss": stop_loss,
-                        "take_profit_targets": take_profit_targets,
-                        "reason": decision.get('reason'),
-                    }
-                )
-            else:
-                self.logger.error(f"SELL order failed: {result.get('error', 'Unknown error')}")
-                self._log_journal(
-                    "order_error",
-                    {
-                        "coin": coin,
-                        "action": "sell",
-                        "error": result.get('error', 'Unknown error'),
-                        "decision": decision,
-                    }
-                )
-                
-        except Exception as e:
-            self.logger.error(f"Error executing sell order: {e}")
+            
+            self.logger.info(
+                "%s order executed: %s %s @ $%.2f (leverage: %sx, SL: $%.2f, TP: $%.2f)",
+                label, coin, size, price, leverage, stop_loss, take_profit
+            )
+            self._log_journal(
+                "order_fill",
+                {
+                    "coin": coin,
+                    "action": action,
+                    "size": size,
+                    "entry_price": price,
+                    "leverage": leverage,
+                    "stop_loss": stop_loss,
+                    "take_profit_targets": take_profit_targets,
+                    "reason": decision.get('reason'),
+                }
+            )
+        else:
+            self.logger.error(f"{label} order failed: {result.get('error', 'Unknown error')}")
+            self._log_journal(
+                "order_error",
+                {
+                    "coin": coin,
+                    "action": action,
+                    "error": result.get('error', 'Unknown error'),
+                    "decision": decision,
+                }
+            )
     
     def _execute_close(self, coin: str, decision: Dict[str, Any]):
         """Execute close position"""
+        position = self.positions.get(coin)
+        if position is None:
+            return
+
+        exit_price = self._extract_price(self.last_prices.get(coin, position['entry_price']), position['entry_price'])
+        
+        # Place opposite order to close
         try:
-            if coin not in self.positions:
-                return
-            
-            position = self.positions[coin]
-            exit_price = self._extract_price(self.last_prices.get(coin, position['entry_price']), position['entry_price'])
-            
-            # Place opposite order to close
             result = self.executor.place_order(
                 coin=coin,
                 is_buy=not position['is_long'],
@@ -567,65 +711,126 @@ class TradingBot:
                 price=None,  # Market order
                 reduce_only=True
             )
-            
-            if result.get('status') == 'ok':
-                # Calculate PnL
-                entry_price = position['entry_price']
-                size = position['size']
-                leverage = position.get('leverage', 1)
-                price_diff = exit_price - entry_price
-                if not position['is_long']:
-                    price_diff = entry_price - exit_price
-                pnl = price_diff * size * leverage
+        except Exception as e:
+            self.logger.error(f"Error closing position: {e}")
+            return
+        
+        self._record_close(coin, position, exit_price, decision, result)
+    
+    def _record_close(
+        self,
+        coin: str,
+        position: Dict[str, Any],
+        exit_price: float,
+        decision: Dict[str, Any],
+        result: Dict[str, Any]
+    ):
+        """
+        Book the outcome of a closing order
+        
+        Args:
+            coin: Coin symbol
+            position: Position being closed
+            exit_price: Price used for the realized PnL
+            decision: Decision that triggered the close (for its reason)
+            result: Executor result for the closing order
+        """
+        if result.get('status') == 'ok':
+            # Calculate PnL
+            entry_price = position['entry_price']
+            size = position['size']
+            leverage = position.get('leverage', 1)
+            price_diff = exit_price - entry_price
+            if not position['is_long']:
+                price_diff = entry_price - exit_price
+            pnl = price_diff * size * leverage
+            with self._state_lock:
                 self.realized_pnl += pnl
+                self._trade_stats["closed"] += 1
+                self._trade_stats["wins"] += pnl > 0
 
                 # Remove from tracking
                 self.risk_manager.remove_position(coin)
-                del self.positions[coin]
+                self.positions.pop(coin, None)
+                self._positions_changed()
                 
-                # Record trade
-                self.trade_history.append({
-                    'coin': coin,
-                    'entry_time': position['entry_time'],
-                    'exit_time': datetime.now(),
-                    'entry_price': position['entry_price'],
-                    'exit_price': exit_price,
-                    'size': position['size'],
-                    'is_long': position['is_long'],
-                    'pnl': pnl,
-                    'reason': decision.get('reason', 'N/A')
-                })
-                
-                self.logger.info(f"Position closed: {coin} - {decision.get('reason', 'N/A')}")
-                self._log_journal(
-                    "order_close",
-                    {
-                        "coin": coin,
-                        "exit_price": exit_price,
-                        "pnl": pnl,
-                        "reason": decision.get('reason'),
-                    }
-                )
-            else:
-                self.logger.error(f"Close order failed: {result.get('error', 'Unknown error')}")
-                self._log_journal(
-                    "order_error",
-                    {
-                        "coin": coin,
-                        "action": "close",
-                        "error": result.get('error', 'Unknown error'),
-                        "decision": decision,
-                    }
+                # Record trade: bounded in memory, complete on disk
+                trade = Trade(
+                    coin=coin,
+                    entry_time=position['entry_time'],
+                    exit_time=self._now(),
+                    entry_price=position['entry_price'],
+                    exit_price=exit_price,
+                    size=position['size'],
+                    is_long=position['is_long'],
+                    pnl=pnl,
+                    reason=decision.get('reason', 'N/A')
                 )
-                
-        except Exception as e:
-            self.logger.error(f"Error closing position: {e}")
+                self.trade_history.append(trade)
+                self._append_trade_log(trade)
+            
+            self.logger.info("Position closed: %s - %s", coin, decision.get('reason', 'N/A'))
+            self._log_journal(
+                "order_close",
+                {
+                    "coin": coin,
+                    "exit_price": exit_price,
+                    "pnl": pnl,
+                    "reason": decision.get('reason'),
+                }
+            )
+        else:
+            self.logger.error(f"Close order failed: {result.get('error', 'Unknown error')}")
+            self._log_journal(
+                "order_error",
+                {
+                    "coin": coin,
+                    "action": "close",
+                    "error": result.get('error', 'Unknown error'),
+                    "decision": decision,
+                }
+            )
     
     def _close_all_positions(self):
-        """Close all open positions"""
+        """Close all open positions with one batched order submission"""
         self.logger.info("Closing all positions...")
-        for coin in list(self.positions.keys()):
-            self._execute_close(coin, {'reason': 'Bot shutdown'})
+        if not self.positions:
+            return
+        # One mids snapshot prices every exit instead of the last cycle's
+        # (possibly stale) prices
+        mids = self.market_data.get_all_mids_cached()
+        for coin in self.positions:
+            if coin in mids:
+                self.last_prices[coin] = float(mids[coin])
+        # Stamp every shutdown close and journal row with one clock reading
+        self._cycle_now = datetime.now()
+        self._cycle_iso = self._cycle_now.isoformat()
+        try:
+            positions = list(self.positions.items())
+            results = self.executor.place_orders_batch([
+                {
+                    'coin': coin,
+                    'is_buy': not position['is_long'],
+                    'size': position['size'],
+                    'price': None,  # Market order
+                    'reduce_only': True,
+                }
+                for coin, position in positions
+            ])
+            decision = {'reason': 'Bot shutdown'}
+            extract_price = self._extract_price
+            last_prices = self.last_prices
+            record_close = self._record_close
+            for (coin, position), result in zip(positions, results):
+                try:
+                    entry_price = position['entry_price']
+                    exit_price = extract_price(last_prices.get(coin, entry_price), entry_price)
+                    record_close(coin, position, exit_price, decision, result)
+                except Exception as e:
+                    self.logger.error(f"Error closing position: {e}")
+        finally:
+            self._cycle_now = None
+            self._cycle_iso = None
     
     def _update_account_state(self):
         """Update account state from exchange"""
@@ -635,34 +840,41 @@ class TradingBot:
     
     def _log_current_state(self):
         """Log current trading state"""
-        metrics = self.risk_manager.get_risk_metrics()
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        metrics = self._risk_metrics()
         
         self.logger.info(
-            f"Capital: ${metrics['current_capital']:,.2f} | "
-            f"Drawdown: {metrics['drawdown']:.2%} | "
-            f"Positions: {metrics['num_positions']}"
+            "Capital: $%s | Drawdown: %.2f%% | Positions: %d",
+            _usd(metrics['current_capital']), metrics['drawdown'] * 100, metrics['num_positions']
         )
     
     def _print_statistics(self):
         """Print final statistics"""
-        self.logger.info("=" * 60)
-        self.logger.info("Final Statistics")
-        self.logger.info("=" * 60)
-        
-        metrics = self.risk_manager.get_risk_metrics()
-        
-        self.logger.info(f"Initial Capital: ${metrics['initial_capital']:,.2f}")
-        self.logger.info(f"Final Capital: ${metrics['current_capital']:,.2f}")
-        self.logger.info(f"Total Return: {((metrics['current_capital'] / metrics['initial_capital']) - 1) * 100:.2f}%")
-        self.logger.info(f"Max Drawdown: {metrics['drawdown']:.2%}")
-        self.logger.info(f"Total Trades: {len(self.trade_history)}")
-        
-        if self.trade_history:
-            # Calculate win rate
-            # wins = sum(1 for t in self.trade_history if t.get('pnl', 0) > 0)
-            # win_rate = wins / len(self.trade_history)
-            # self.logger.info(f"Win Rate: {win_rate:.2%}")
-            pass
+        # The report is log-only; skip all formatting when INFO is off
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        metrics = self._risk_metrics()
+        current_capital = metrics['current_capital']
+        closed = self._trade_stats["closed"]
+        
+        total_return = (current_capital / metrics['initial_capital']) - 1
+        rows = (
+            ("Initial Capital:", self._initial_capital_str),
+            ("Final Capital:", f"${_usd(current_capital)}"),
+            ("Total Return:", f"{total_return:.2%}"),
+            ("Max Drawdown:", f"{metrics['drawdown']:.2%}"),
+            ("Opened Trades:", self._trade_stats["opened"]),
+            ("Total Trades:", closed),
+        )
+        if closed:
+            win_rate = self._trade_stats["wins"] / closed
+            rows += (("Win Rate:", f"{win_rate:.2%}"),)
+        # Emit the whole report as one record: a single handler write/lock
+        # and the block stays contiguous when other threads are logging
+        lines = [SECTION_RULE, "Final Statistics", SECTION_RULE]
+        lines.extend(STATISTICS_ROW_FORMAT.format(label, value) for label, value in rows)
+        self.logger.info("\n".join(lines))
     
     def _fetch_startup_news(self):
         """
@@ -671,42 +883,45 @@ class TradingBot:
         if not self.news_analyzer:
             self.logger.info("News analyzer not available, skipping startup news fetch")
             return
+        # The storage reads below only feed the INFO report
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         
         try:
-            from datetime import datetime, timedelta
-            
-            self.logger.info("=" * 60)
             self.logger.info("Fetching news from the past hour...")
-            self.logger.info("=" * 60)
             
             # Calculate time range (past 1 hour)
             end_time = datetime.now()
             start_time = end_time - timedelta(hours=1)
             
-            self.logger.info(f"Time range: {start_time} to {end_time}")
+            # Build the whole report, then emit it as a single record
+            lines = [SECTION_RULE, f"Time range: {start_time} to {end_time}"]
             
             # Fetch hourly news
             news_items = self.news_analyzer.storage.get_hourly_news_range(start_time, end_time)
             
             if news_items:
-                self.logger.info(f"✅ Found {len(news_items)} news items from the past hour")
-                for item in news_items:
-                    self.logger.info(f"  - [{item.get('timestamp')}] {item.get('summary', 'N/A')[:80]}...")
+                lines.append(f"✅ Found {len(news_items)} news items from the past hour")
+                lines.extend(
+                    f"  - [{item.get('timestamp')}] {item.get('summary', 'N/A')[:80]}..."
+                    for item in news_items
+                )
             else:
-                self.logger.info("ℹ️  No news found in the past hour")
-                self.logger.info("💡 Tip: Run news collection script to populate news data")
+                lines.append("ℹ️  No news found in the past hour")
+                lines.append("💡 Tip: Run news collection script to populate news data")
             
-            # Also check daily summaries
-            today = datetime.now().date()
+            # Also check daily summaries (same clock reading as the range above)
+            today = end_time.date()
             daily_summary = self.news_analyzer.storage.get_daily_summary(today)
             
             if daily_summary:
-                self.logger.info(f"✅ Found today's daily summary")
-                self.logger.info(f"  Key themes: {', '.join(daily_summary.get('key_themes', [])[:3])}")
+                lines.append("✅ Found today's daily summary")
+                lines.append(f"  Key themes: {', '.join(daily_summary.get('key_themes', [])[:3])}")
             else:
-                self.logger.info("ℹ️  No daily summary for today yet")
+                lines.append("ℹ️  No daily summary for today yet")
             
-            self.logger.info("=" * 60)
+            lines.append(SECTION_RULE)
+            self.logger.info("\n".join(lines))
             
         except Exception as e:
             self.logger.error(f"Error fetching startup news: {e}", exc_info=True)
@@ -722,23 +937,31 @@ class TradingBot:
         all_market_data = {}
         unavailable = []
         
+        # One batched fetch for every symbol: shared mids/meta, parallel candles
+        comprehensive = self.enhanced_market_data.get_comprehensive_market_data_bulk(
+            list(self.trading_pairs)
+        )
+        
+        errors = []
+        get_data = comprehensive.get
         for coin in self.trading_pairs:
-            try:
-                # Get comprehensive market data with technical indicators
-                coin_data = self.enhanced_market_data.get_comprehensive_market_data(coin)
-                
-                if coin_data.get('available'):
-                    all_market_data[coin] = coin_data
-                    self.logger.debug(f"{coin}: ${coin_data.get('current_price', 0):,.2f}")
-                else:
-                    unavailable.append(coin)
-                    self.logger.warning(f"{coin}: {coin_data.get('error', 'Data not available')}")
-                    
-            except Exception as e:
-                self.logger.error(f"Error getting data for {coin}: {e}")
+            coin_data = get_data(coin, {})
+            if coin_data.get('available'):
+                all_market_data[coin] = coin_data
+            else:
                 unavailable.append(coin)
+                errors.append(f"{coin}: {coin_data.get('error', 'Data not available')}")
         
-        self.logger.info(f"Collected data for {len(all_market_data)} symbols, {len(unavailable)} unavailable")
+        # One record per table instead of one per symbol
+        if all_market_data and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Market prices: %s", " | ".join(
+                f"{coin} ${_usd(data.get('current_price', 0))}" for coin, data in all_market_data.items()
+            ))
+        if errors:
+            self.logger.warning("Market data unavailable: %s", "; ".join(errors))
+        self.logger.info(
+            "Collected data for %d symbols, %d unavailable", len(all_market_data), len(unavailable)
+        )
         
         return {
             'market_data': all_market_data,
@@ -752,122 +975,143 @@ class TradingBot:
         Returns:
             List of recent order dictionaries
         """
-        # Return last 10 trades from history
-        return self.trade_history[-10:] if self.trade_history else []
+        # Return last 10 trades from history, walking only the deque's tail;
+        # the prompt renders them as JSON objects, so expand them to dicts
+        return [trade._asdict() for trade in islice(reversed(self.trade_history), 10)][::-1]
     
-    def _execute_trading_plan(self, trading_plan: Dict[str, Any]):
+    def _execute_trading_plan(
+        self,
+        trading_plan: Dict[str, Any],
+        skip_symbols: Optional[set] = None
+    ) -> List[Future]:
         """
-        Execute the trading plan generated by AI
+        Submit the trading plan generated by AI for execution
         
         Args:
             trading_plan: Trading plan dictionary from DeepseekTradingAgent
+            skip_symbols: Symbols already handled while the plan was streaming
+        
+        Returns:
+            Futures for the submitted candidates
         """
         candidates = trading_plan.get('candidates', [])
+        if skip_symbols:
+            candidates = [c for c in candidates if c.get('symbol') not in skip_symbols]
+            if not candidates:
+                self.logger.info("All plan candidates were handled while streaming")
+                return []
         
         if not candidates:
             self.logger.info("No trading candidates in plan")
-            return
+            return []
         
-        self.logger.info(f"Executing trading plan with {len(candidates)} candidates")
+        self.logger.info("Executing trading plan with %d candidates", len(candidates))
         
-        for candidate in candidates:
-            try:
-                symbol = candidate.get('symbol')
-                direction = candidate.get('direction')
-                
-                if symbol not in self.trading_pairs:
-                    self.logger.warning(f"Skipping {symbol}: not in allowed symbols")
-                    continue
-                
-                # Convert to action
-                direction_upper = str(direction).upper()
-                if direction_upper == 'LONG':
-                    action = 'buy'
-                elif direction_upper == 'SHORT':
-                    action = 'sell'
-                elif direction_upper.startswith('HOLD'):
-                    self.logger.info(f"{symbol}: HOLD signal ({direction_upper}), skipping trade execution")
-                    self._log_journal(
-                        "hold_signal",
-                        {
-                            "coin": symbol,
-                            "direction": direction_upper,
-                            "reason": candidate.get('rationale')
-                        }
-                    )
-                    continue
-                else:
-                    self.logger.warning(f"Unknown direction {direction} for {symbol}, treating as HOLD")
-                    self._log_journal(
-                        "hold_signal",
-                        {
-                            "coin": symbol,
-                            "direction": direction_upper,
-                            "reason": candidate.get('rationale')
-                        }
-                    )
-                    continue
-                
-                # Build decision dict compatible with existing execution methods
-                entry = candidate.get('entry', {})
-                position_info = candidate.get('position', {})
-                market_price = self.last_prices.get(symbol)
-                entry_price = self._extract_price(
-                    entry.get('price'),
-                    default=market_price or 0.0,
+        return [
+            self._execution_pool.submit(self._execute_candidate, candidate)
+            for candidate in candidates
+        ]
+    
+    def _execute_candidate(self, candidate: Dict[str, Any]):
+        """
+        Execute a single trading plan candidate
+        
+        Args:
+            candidate: Candidate dictionary from the trading plan
+        """
+        try:
+            symbol = candidate.get('symbol')
+            direction = candidate.get('direction')
+            
+            if symbol not in self._trading_pairs_set:
+                self.logger.warning("Skipping %s: not in allowed symbols", symbol)
+                return
+            
+            # Convert to action
+            direction_upper = str(direction).upper()
+            if direction_upper == 'LONG':
+                action = 'buy'
+            elif direction_upper == 'SHORT':
+                action = 'sell'
+            elif direction_upper.startswith('HOLD'):
+                self.logger.info("%s: HOLD signal (%s), skipping trade execution", symbol, direction_upper)
+                self._log_journal(
+                    "hold_signal",
+                    {
+                        "coin": symbol,
+                        "direction": direction_upper,
+                        "reason": candidate.get('rationale')
+                    }
                 )
-                if entry.get('price') in (None, "", 0) and entry_price:
-                    self.logger.debug(
-                        f"{symbol}: Using market price {entry_price} as fallback entry"
-                    )
-                elif entry_price <= 0:
-                    self.logger.warning(
-                        f"{symbol}: No valid entry price available; skipping candidate"
-                    )
-                    self._log_journal(
-                        "hold_signal",
-                        {
-                            "coin": symbol,
-                            "direction": direction_upper,
-                            "reason": "No valid entry price available",
-                        }
-                    )
-                    continue
-                
-                size_pct = position_info.get('size_pct', 0.1)
-                if not isinstance(size_pct, (int, float)) or size_pct <= 0:
-                    size_pct = 0.1
-                leverage_hint = position_info.get(
-                    'leverage_hint',
-                    self.risk_manager.default_leverage or 1,
+                return
+            else:
+                self.logger.warning("Unknown direction %s for %s, treating as HOLD", direction, symbol)
+                self._log_journal(
+                    "hold_signal",
+                    {
+                        "coin": symbol,
+                        "direction": direction_upper,
+                        "reason": candidate.get('rationale')
+                    }
                 )
-                if not isinstance(leverage_hint, (int, float)) or leverage_hint <= 0:
-                    leverage_hint = self.risk_manager.default_leverage or 1
-
-                decision = {
-                    'action': action,
-                    'entry_price': entry_price,
-                    'stop_loss': candidate.get('stop_loss', 0),
-                    'take_profit': candidate.get('take_profit', 0),
-                    'size': size_pct,
-                    'leverage': leverage_hint,
-                    'reason': candidate.get('rationale', 'AI orchestrator decision'),
-                    'confidence': 0.8  # Default confidence
-                }
-                
+                return
+            
+            # Build decision dict compatible with existing execution methods
+            entry = candidate.get('entry', {})
+            position_info = candidate.get('position', {})
+            market_price = self.last_prices.get(symbol)
+            raw_entry_price = entry.get('price')
+            entry_price = self._extract_price(
+                raw_entry_price,
+                default=market_price or 0.0,
+            )
+            if raw_entry_price in (None, "", 0) and entry_price:
+                self.logger.debug(
+                    "%s: Using market price %s as fallback entry", symbol, entry_price
+                )
+            elif entry_price <= 0:
+                self.logger.warning(
+                    "%s: No valid entry price available; skipping candidate", symbol
+                )
+                self._log_journal(
+                    "hold_signal",
+                    {
+                        "coin": symbol,
+                        "direction": direction_upper,
+                        "reason": "No valid entry price available",
+                    }
+                )
+                return
+            
+            size_pct = position_info.get('size_pct', 0.1)
+            if not isinstance(size_pct, (int, float)) or size_pct <= 0:
+                size_pct = 0.1
+            default_leverage = self.risk_manager.default_leverage or 1
+            leverage_hint = position_info.get('leverage_hint', default_leverage)
+            if not isinstance(leverage_hint, (int, float)) or leverage_hint <= 0:
+                leverage_hint = default_leverage
+
+            decision = {
+                'action': action,
+                'entry_price': entry_price,
+                'stop_loss': candidate.get('stop_loss', 0),
+                'take_profit': candidate.get('take_profit', 0),
+                'size': size_pct,
+                'leverage': leverage_hint,
+                'reason': candidate.get('rationale', 'AI orchestrator decision'),
+                'confidence': 0.8  # Default confidence
+            }
+            
+            if self.logger.isEnabledFor(logging.INFO):
                 self.logger.info(
-                    f"{symbol}: Action={action.upper()}, "
-                    f"Reason={decision.get('reason', 'N/A')[:50]}..."
+                    "%s: Action=%s, Reason=%s...",
+                    symbol, action.upper(), str(decision.get('reason', 'N/A'))[:50]
                 )
+            
+            self._execute_order(symbol, decision, is_long=(action == 'buy'))
                 
-                # Execute using existing methods
-                if action == 'buy':
-                    self._execute_buy(symbol, decision)
-                elif action == 'sell':
-                    self._execute_sell(symbol, decision)
-                    
-            except Exception as e:
-                self.logger.error(f"Error executing candidate for {symbol}: {e}")
+        except Exception as e:
+            self.logger.error(f"Error executing candidate for {symbol}: {e}")
 
 
 def main():
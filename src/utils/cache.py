@@ -0,0 +1,90 @@
+"""
+Small in-process caches for expensive results (e.g. AI decisions)
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def prompt_key(prompt: str) -> bytes:
+    """
+    Hash a prompt into a compact cache key
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        16-byte blake2b digest of the UTF-8 encoded prompt
+    """
+    return hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a fixed time
+
+    Lookups refresh recency; once maxsize is reached the least recently used
+    entry is evicted. Hit and miss counts are kept for reporting.
+    """
+
+    def __init__(self, maxsize: int = 32, ttl: float = 600.0):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Time to live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if expired/not found
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Set cached value, evicting the least recently used entry if full
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Clear all cached values"""
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -5,6 +5,8 @@ Constants and configuration values for the trading system.
 # Allowed trading symbols - WHITELIST
 # Only these 6 symbols are permitted for trading on Hyperliquid
 ALLOWED_SYMBOLS = ["XRP", "DOGE", "BTC", "ETH", "SOL", "BNB"]
+# Set view of the whitelist for membership checks
+ALLOWED_SYMBOLS_SET = frozenset(ALLOWED_SYMBOLS)
 
 # Trading directions
 DIRECTION_LONG = "LONG"
@@ -0,0 +1,80 @@
+"""
+Shared HTTP client factory for OpenAI-compatible API clients
+"""
+from typing import Optional
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+
+# Seconds an idle pooled connection is kept open
+KEEPALIVE_EXPIRY = 300.0
+# Seconds allowed for establishing a connection
+CONNECT_TIMEOUT = 5.0
+
+
+def _limits(max_connections: int):
+    """Connection pool limits shared by the sync and async factories"""
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        # Keep idle connections past a full trading interval so each cycle
+        # reuses the warm TLS session instead of reconnecting
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+def _timeout(timeout: float):
+    """Request timeout with a short connect phase, so a dead host fails fast"""
+    return httpx.Timeout(timeout, connect=CONNECT_TIMEOUT)
+
+
+def create_http_client(timeout: float = 30.0, max_connections: int = 4) -> Optional["httpx.Client"]:
+    """
+    Create a pooled keep-alive HTTP client, multiplexed over HTTP/2 when h2 is installed
+
+    Args:
+        timeout: Request timeout in seconds
+        max_connections: Connection pool size
+
+    Returns:
+        httpx.Client, or None when httpx is unavailable (callers then use the SDK default)
+    """
+    if not HTTPX_AVAILABLE:
+        return None
+    return httpx.Client(
+        http2=H2_AVAILABLE,
+        limits=_limits(max_connections),
+        # No explicit Connection header: httpx keeps pooled connections alive
+        # already, and HTTP/2 rejects connection-specific headers
+        timeout=_timeout(timeout)
+    )
+
+
+def create_async_http_client(timeout: float = 30.0, max_connections: int = 4) -> Optional["httpx.AsyncClient"]:
+    """
+    Create a pooled async HTTP client, multiplexed over HTTP/2 when h2 is installed
+
+    Args:
+        timeout: Request timeout in seconds
+        max_connections: Connection pool size
+
+    Returns:
+        httpx.AsyncClient, or None when httpx is unavailable
+    """
+    if not HTTPX_AVAILABLE:
+        return None
+    return httpx.AsyncClient(
+        http2=H2_AVAILABLE,
+        limits=_limits(max_connections),
+        timeout=_timeout(timeout)
+    )
@@ -0,0 +1,213 @@
+"""
+JSON helpers for parsing AI responses
+"""
+import json
+import re
+from typing import Any, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Outermost JSON object: first '{' to last '}', across newlines.
+# Handles fenced (```json ... ```), bare and prose-embedded replies alike.
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.S)
+
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize JSON using orjson when available
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        ValueError: If the document is not valid JSON (both orjson and json
+            decode errors subclass ValueError)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values neither encoder handles natively (numpy scalars, dates, ...)"""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize to a compact UTF-8 JSON string using orjson when available
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON text (non-ASCII characters are kept as-is)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_default)
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    Extract the outermost JSON object from free-form text
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        JSON object substring, or None if no braces are present
+    """
+    if not text:
+        return None
+    match = _JSON_OBJECT_RE.search(text)
+    return match.group(0) if match else None
+
+
+def scan_first_object(text: str) -> Optional[str]:
+    """
+    Find the first complete top-level JSON object by tracking brace depth
+
+    Unlike the greedy regex this stops at the object's own closing brace, so
+    trailing prose that contains braces does not corrupt the match.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        JSON object substring, or None if no complete object is present
+    """
+    depth = 0
+    start = None
+    in_string = False
+    escape = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = start is not None
+        elif char == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+
+def parse_json_object(text: str) -> Any:
+    """
+    Extract and parse the outermost JSON object from free-form text
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Parsed JSON object
+
+    Raises:
+        ValueError: If no JSON object is found or it fails to parse
+    """
+    # JSON-mode replies are the object itself: parse without scanning
+    if text and text.lstrip()[:1] == "{":
+        try:
+            return loads(text)
+        except ValueError:
+            pass
+    json_str = extract_json_object(text)
+    if json_str is None:
+        raise ValueError("No JSON object found in response")
+    try:
+        return loads(json_str)
+    except ValueError:
+        # Fall back to the first balanced object (e.g. prose with braces after it)
+        first = scan_first_object(json_str)
+        if first is None or first == json_str:
+            raise
+        return loads(first)
+
+
+class StreamingObjectScanner:
+    """
+    Incrementally scan streamed JSON text for completed array elements
+
+    Emits every object that is a direct element of an array one level inside
+    the top-level object (e.g. each entry of "candidates") as soon as its
+    closing brace arrives, without waiting for the rest of the document.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._element_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Full text received so far"""
+        return self._text
+
+    def feed(self, chunk: str) -> list:
+        """
+        Consume the next chunk of streamed text
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Objects completed by this chunk (malformed elements are skipped)
+        """
+        self._text += chunk
+        completed = []
+        text = self._text
+        stack = self._stack
+
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and stack == ["{", "["]:
+                    self._element_start = i
+                stack.append(char)
+            elif char in "}]" and stack:
+                stack.pop()
+                if char == "}" and stack == ["{", "["] and self._element_start is not None:
+                    try:
+                        completed.append(loads(text[self._element_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._element_start = None
+
+        self._pos = len(text)
+        return completed
@@ -1,10 +1,14 @@
 """
 Logging module
 """
+import atexit
+import io
 import logging
+import queue
 import sys
+import traceback
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
 try:
@@ -14,6 +18,30 @@ except ImportError:
     COLORLOG_AVAILABLE = False
 
 
+class _TracebackLimitMixin:
+    """Formatter mixin that keeps only the innermost frames of a traceback"""
+    
+    traceback_limit: Optional[int] = None
+    
+    def formatException(self, ei) -> str:
+        """Format exception info, trimmed to ``traceback_limit`` frames"""
+        if self.traceback_limit is None:
+            return super().formatException(ei)
+        buffer = io.StringIO()
+        # A negative limit keeps the frames closest to where the error was raised
+        traceback.print_exception(ei[0], ei[1], ei[2], limit=-self.traceback_limit, file=buffer)
+        return buffer.getvalue().rstrip("\n")
+
+
+class LimitedTracebackFormatter(_TracebackLimitMixin, logging.Formatter):
+    """Plain formatter with trimmed tracebacks"""
+
+
+if COLORLOG_AVAILABLE:
+    class _ColoredLimitedTracebackFormatter(_TracebackLimitMixin, colorlog.ColoredFormatter):
+        """Colored formatter with trimmed tracebacks"""
+
+
 class Logger:
     """Custom logger with color support and file rotation"""
     
@@ -24,7 +52,9 @@ class Logger:
         log_to_file: bool = True,
         log_file: str = None,
         max_bytes: int = 10485760,
-        backup_count: int = 5
+        backup_count: int = 5,
+        traceback_limit: Optional[int] = 4,
+        use_queue: bool = False
     ):
         """
         Initialize logger
@@ -36,19 +66,24 @@ class Logger:
             log_file: Log file path
             max_bytes: Maximum log file size in bytes
             backup_count: Number of backup files to keep
+            traceback_limit: Frames kept per logged traceback (None for all)
+            use_queue: Hand records to a background thread that owns the
+                console/file handlers, so callers never block on log I/O
         """
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.upper()))
         
         # Remove existing handlers
         self.logger.handlers = []
+        handlers = []
+        self._listener: Optional[QueueListener] = None
         
         # Console handler with color
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, level.upper()))
         
         if COLORLOG_AVAILABLE:
-            console_formatter = colorlog.ColoredFormatter(
+            console_formatter = _ColoredLimitedTracebackFormatter(
                 '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S',
                 log_colors={
@@ -60,13 +95,14 @@ class Logger:
                 }
             )
         else:
-            console_formatter = logging.Formatter(
+            console_formatter = LimitedTracebackFormatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
+        console_formatter.traceback_limit = traceback_limit
         
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler with rotation
         if log_to_file and log_file:
@@ -81,12 +117,48 @@ class Logger:
             )
             file_handler.setLevel(getattr(logging, level.upper()))
             
-            file_formatter = logging.Formatter(
+            file_formatter = LimitedTracebackFormatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
+            file_formatter.traceback_limit = traceback_limit
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        self._handlers = handlers
+        if use_queue:
+            queue_handler = QueueHandler(queue.SimpleQueue())
+            # The record message (including any trimmed traceback) is rendered
+            # once on the calling thread; the listener only writes it out
+            queue_formatter = LimitedTracebackFormatter('%(message)s')
+            queue_formatter.traceback_limit = traceback_limit
+            queue_handler.setFormatter(queue_formatter)
+            self.logger.addHandler(queue_handler)
+            self._listener = QueueListener(
+                queue_handler.queue, *handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            atexit.register(self.stop)
+        else:
+            for handler in handlers:
+                self.logger.addHandler(handler)
+    
+    def stop(self):
+        """
+        Drain queued records and switch back to writing synchronously
+        
+        Safe to call more than once; records logged afterwards still reach
+        the console/file handlers directly.
+        """
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        listener.stop()
+        self.logger.handlers = list(self._handlers)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a message at this level would be emitted"""
+        return self.logger.isEnabledFor(level)
     
     def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
@@ -128,6 +200,9 @@ def get_logger(
     """
     Get global logger instance
     
+    The global logger writes through a background queue listener, so
+    logging on the trading thread is only an enqueue.
+    
     Args:
         name: Logger name
         level: Log level
@@ -152,7 +227,8 @@ def get_logger(
             log_to_file=log_to_file,
             log_file=str(log_file),
             max_bytes=max_bytes,
-            backup_count=backup_count
+            backup_count=backup_count,
+            use_queue=True
         )
     
     return _logger_instance
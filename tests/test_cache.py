@@ -0,0 +1,138 @@
+"""
+Unit tests for the TTL/LRU cache and AI decision reuse
+"""
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import cache as cache_module
+from src.utils.cache import TTLCache, prompt_key
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test cache expiry, eviction and statistics"""
+
+    def test_get_and_hit_rate(self):
+        """Test hits and misses are counted"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently read entry is dropped when full"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are not returned"""
+        cache = TTLCache(maxsize=2, ttl=10)
+        with patch.object(cache_module.time, 'monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with patch.object(cache_module.time, 'monotonic', return_value=111.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_prompt_key(self):
+        """Test prompt keys are stable 16-byte digests"""
+        self.assertEqual(prompt_key("abc"), prompt_key("abc"))
+        self.assertNotEqual(prompt_key("abc"), prompt_key("abd"))
+        self.assertEqual(len(prompt_key("abc")), 16)
+
+
+class TestDecisionCache(unittest.TestCase):
+    """Test the trading agent reuses plans for unchanged context"""
+
+    @patch('src.ai.deepseek_trading_agent.OpenAI')
+    def test_unchanged_context_skips_api_call(self, mock_openai):
+        """Test a second cycle with the same context reuses the cached plan"""
+        from src.ai.deepseek_trading_agent import DeepseekTradingAgent
+
+        agent = DeepseekTradingAgent({'api_key': 'test-key', 'stream': False})
+        agent._log_dialog = Mock()
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = '{"candidates": [{"symbol": "BTC", "direction": "LONG"}]}'
+        response.usage = None
+        agent.client.chat.completions.create.return_value = response
+
+        market_data = {'BTC': {'symbol': 'BTC', 'available': False, 'error': 'test'}}
+        first = agent.generate_trading_plan(market_data, {}, [])
+        second = agent.generate_trading_plan(market_data, {}, [])
+
+        self.assertEqual(agent.client.chat.completions.create.call_count, 1)
+        self.assertEqual(first['candidates'], second['candidates'])
+        self.assertIsNot(first, second)
+
+        # A changed position snapshot is a different context
+        agent.generate_trading_plan(market_data, {'BTC': {'size': 1}}, [])
+        self.assertEqual(agent.client.chat.completions.create.call_count, 2)
+
+    @patch('src.ai.deepseek_agent.OpenAI')
+    def test_unchanged_market_skips_analysis_call(self, mock_openai):
+        """Test the per-coin agent reuses its decision for an identical prompt"""
+        from src.ai.deepseek_agent import DeepseekAgent
+
+        agent = DeepseekAgent({'api_key': 'test-key', 'stream': False})
+        agent._log_dialog = Mock()
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = '{"action": "BUY", "confidence": 0.9}'
+        response.usage = None
+        agent.client.chat.completions.create.return_value = response
+
+        first = agent.analyze_market('BTC', {'price': 100.0}, {'rsi': 55.0})
+        second = agent.analyze_market('BTC', {'price': 100.001}, {'rsi': 55.0})
+
+        self.assertEqual(agent.client.chat.completions.create.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+        agent.analyze_market('ETH', {'price': 100.0}, {'rsi': 55.0})
+        self.assertEqual(agent.client.chat.completions.create.call_count, 2)
+
+    @patch('src.ai.deepseek_agent.OpenAI')
+    def test_similar_market_state_reuses_decision(self, mock_openai):
+        """Test a state within tolerance reuses the last decision and one outside does not"""
+        from src.ai.deepseek_agent import DeepseekAgent
+
+        agent = DeepseekAgent({
+            'api_key': 'test-key',
+            'stream': False,
+            'similar_state_tolerance': 0.01,
+        })
+        agent._log_dialog = Mock()
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = '{"action": "BUY", "confidence": 0.9}'
+        response.usage = None
+        agent.client.chat.completions.create.return_value = response
+
+        first = agent.analyze_market('BTC', {'price': 100.0}, {'rsi': 55.0, 'sma': 99.0})
+        # A different prompt, but every state feature moves by less than 0.01
+        nearby = agent.analyze_market('BTC', {'price': 100.0}, {'rsi': 55.5, 'sma': 99.5})
+
+        self.assertEqual(agent.client.chat.completions.create.call_count, 1)
+        self.assertEqual(first, nearby)
+
+        # RSI moves by 0.05 of its range, beyond the tolerance
+        agent.analyze_market('BTC', {'price': 100.0}, {'rsi': 60.0, 'sma': 99.0})
+        self.assertEqual(agent.client.chat.completions.create.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Unit tests for the per-coin Deepseek agent
+"""
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai import deepseek_agent as agent_module
+
+
+def _make_response(content):
+    """Non-streamed chat completion carrying the given reply"""
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    response.usage = None
+    return response
+
+
+class TestNormalizeDecision(unittest.TestCase):
+    """Test decisions are clamped to the schema in the system prompt"""
+
+    @patch('src.ai.deepseek_agent.OpenAI')
+    def test_non_finite_numbers_use_defaults(self, mock_openai):
+        """Test "nan"/"inf" values fall back to the defaults"""
+        from src.ai.deepseek_agent import DeepseekAgent
+
+        agent = DeepseekAgent({'api_key': 'test-key'})
+        decision = agent._normalize_decision({
+            'action': 'BUY',
+            'confidence': 'nan',
+            'leverage': 'inf',
+            'stop_loss': '-inf',
+        })
+
+        self.assertEqual(decision['action'], 'buy')
+        self.assertEqual(decision['confidence'], 0.5)
+        self.assertEqual(decision['leverage'], 3)
+        self.assertEqual(decision['stop_loss'], 0.0)
+
+    @patch('src.ai.deepseek_agent.OpenAI')
+    def test_out_of_range_numbers_are_clamped(self, mock_openai):
+        """Test confidence and leverage are clamped to their ranges"""
+        from src.ai.deepseek_agent import DeepseekAgent
+
+        agent = DeepseekAgent({'api_key': 'test-key'})
+        decision = agent._normalize_decision({'confidence': '1.5', 'leverage': 20})
+
+        self.assertEqual(decision['action'], 'hold')
+        self.assertEqual(decision['confidence'], 1.0)
+        self.assertEqual(decision['leverage'], 5)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test repeated API failures pause analysis for a cooldown"""
+
+    def setUp(self):
+        patcher = patch('src.ai.deepseek_agent.OpenAI')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.now = 1000.0
+        clock = patch.object(agent_module.time, 'monotonic', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+        self.agent = agent_module.DeepseekAgent({
+            'api_key': 'test-key',
+            'stream': False,
+            'decision_cache_ttl': 0,
+            'circuit_breaker_failures': 3,
+            'circuit_breaker_window': 60,
+        })
+        self.agent._log_dialog = Mock()
+        self.create = self.agent.client.chat.completions.create
+        self.create.side_effect = TimeoutError("timed out")
+
+    def _analyze(self):
+        return self.agent.analyze_market('BTC', {'price': 100.0}, {'rsi': 55.0})
+
+    def test_opens_after_failures_within_window(self):
+        """Test the circuit opens once N failures fall inside the window"""
+        for _ in range(2):
+            self._analyze()
+            self.now += 10
+        self.assertFalse(self.agent._circuit_open())
+
+        self._analyze()
+        self.assertTrue(self.agent._circuit_open())
+
+    def test_failures_outside_window_do_not_open(self):
+        """Test failures spread wider than the window keep the circuit closed"""
+        for _ in range(3):
+            self._analyze()
+            self.now += 40
+        self.assertFalse(self.agent._circuit_open())
+
+    def test_open_circuit_returns_hold_without_calling_api(self):
+        """Test calls short-circuit to a hold while the circuit is open"""
+        for _ in range(3):
+            self._analyze()
+
+        decision = self._analyze()
+
+        self.assertEqual(self.create.call_count, 3)
+        self.assertEqual(decision['action'], 'hold')
+        self.assertEqual(decision['confidence'], 0)
+        self.assertIn('paused', decision['reasoning'])
+
+    def test_lets_probe_through_after_cooldown(self):
+        """Test one call reaches the API once the window has passed"""
+        for _ in range(3):
+            self._analyze()
+        self.now += 61
+        self.create.side_effect = None
+        self.create.return_value = _make_response('{"action": "buy", "confidence": 0.8}')
+
+        decision = self._analyze()
+
+        self.assertEqual(self.create.call_count, 4)
+        self.assertEqual(decision['action'], 'buy')
+        self.assertFalse(self.agent._circuit_open())
+
+    def test_successful_reply_resets_failures(self):
+        """Test _handle_decision clears the recorded failures"""
+        for _ in range(2):
+            self._analyze()
+
+        self.agent._handle_decision('BTC', 'prompt', '{"action": "hold"}')
+
+        self.assertEqual(len(self.agent._failure_times), 0)
+        # Starting over, two more failures are not enough to open it
+        for _ in range(2):
+            self._analyze()
+        self.assertFalse(self.agent._circuit_open())
+
+
+def _make_stream(deltas):
+    """Streamed chat completion yielding the given reply pieces"""
+    chunks = []
+    for delta in deltas:
+        chunk = Mock()
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta.content = delta
+        chunk.usage = None
+        chunks.append(chunk)
+    stream = Mock()
+    stream.__iter__ = Mock(return_value=iter(chunks))
+    return stream
+
+
+class TestEarlyDecisionFields(unittest.TestCase):
+    """Test streamed replies are cut off once the decision fields are complete"""
+
+    def setUp(self):
+        patcher = patch('src.ai.deepseek_agent.OpenAI')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.agent = agent_module.DeepseekAgent({'api_key': 'test-key', 'decision_cache_ttl': 0})
+        self.agent._log_dialog = Mock()
+        self.create = self.agent.client.chat.completions.create
+
+    def test_fields_split_across_chunks(self):
+        """Test a value split over several deltas is read once delimited"""
+        self.create.return_value = stream = _make_stream([
+            '{"action": "bu', 'y", "confid', 'ence": 0.', '75, "leverage": ', '2', ', "reasoning": "',
+            'never read"}',
+        ])
+
+        text, fields = self.agent._stream_decision('prompt')
+
+        self.assertEqual(fields, {'action': 'buy', 'confidence': '0.75', 'leverage': '2'})
+        self.assertNotIn('never read', text)
+        stream.close.assert_called_once()
+
+    def test_reordered_keys(self):
+        """Test the fields are found in any order"""
+        fields = agent_module.DeepseekAgent._early_decision_fields(
+            '{"leverage": 4, "confidence": 0.6, "action": "sell"}', '}'
+        )
+
+        self.assertEqual(fields, {'action': 'sell', 'confidence': '0.6', 'leverage': '4'})
+
+    def test_missing_leverage_does_not_exit_early(self):
+        """Test the stream is read on while any field is missing"""
+        text = '{"action": "buy", "confidence": 0.8, "reasoning": "x",'
+
+        self.assertIsNone(agent_module.DeepseekAgent._early_decision_fields(text, ','))
+
+    def test_unfinished_value_does_not_exit_early(self):
+        """Test a value without its delimiter yet is not taken"""
+        text = '{"action": "buy", "confidence": 0.8, "leverage": 1'
+
+        self.assertIsNone(agent_module.DeepseekAgent._early_decision_fields(text, '1'))
+
+    def test_stream_without_fields_falls_back_to_full_parse(self):
+        """Test a reply that ends without all fields is parsed as a whole"""
+        self.create.return_value = _make_stream([
+            '{"action": "sell", ', '"confidence": 0.7, "reasoning": "no leverage given"}',
+        ])
+
+        decision = self.agent.analyze_market('BTC', {'price': 100.0}, {'rsi': 55.0})
+
+        self.assertEqual(decision['action'], 'sell')
+        self.assertEqual(decision['confidence'], 0.7)
+        self.assertEqual(decision['leverage'], 3)
+        self.assertEqual(decision['reasoning'], 'no leverage given')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for enhanced market data indicators
+"""
+import math
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.enhanced_market_data import EnhancedMarketDataCollector
+
+
+class TestIndicators(unittest.TestCase):
+    """Test vectorized indicator calculations"""
+
+    def setUp(self):
+        self.collector = EnhancedMarketDataCollector(None)
+
+    def test_atr_uses_true_range(self):
+        """Test ATR picks the largest of high-low and the gaps to the previous close"""
+        df = pd.DataFrame({
+            'high': [10.0, 12.0, 11.0],
+            'low': [9.0, 11.5, 8.0],
+            'close': [9.5, 11.8, 8.5],
+        })
+        # True ranges: 1.0, |12 - 9.5| = 2.5, |8 - 11.8| = 3.8
+        atr = self.collector.calculate_atr(df, 3)
+
+        self.assertIsInstance(atr, list)
+        self.assertTrue(math.isnan(atr[0]))
+        self.assertAlmostEqual(atr[-1], (1.0 + 2.5 + 3.8) / 3)
+
+    def test_macd_is_ema_difference(self):
+        """Test MACD equals fast EMA minus slow EMA and is NaN until both exist"""
+        prices = [float(i) for i in range(1, 41)]
+        macd = self.collector.calculate_macd(prices)
+        fast = self.collector.calculate_ema(prices, 12)
+        slow = self.collector.calculate_ema(prices, 26)
+
+        self.assertEqual(len(macd), len(prices))
+        self.assertTrue(math.isnan(macd[24]))
+        self.assertAlmostEqual(macd[-1], fast[-1] - slow[-1])
+
+    def test_rsi_all_gains(self):
+        """Test RSI is 100 for a strictly rising series"""
+        rsi = self.collector.calculate_rsi([float(i) for i in range(20)], 14)
+
+        self.assertTrue(math.isnan(rsi[0]))
+        self.assertEqual(rsi[-1], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for AI response JSON helpers
+"""
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import json_utils
+
+
+class TestJsonUtils(unittest.TestCase):
+    """Test JSON extraction from model output"""
+
+    def test_parse_bare_object(self):
+        """Test a bare JSON reply parses directly"""
+        self.assertEqual(json_utils.parse_json_object('{"action": "hold"}'), {"action": "hold"})
+
+    def test_parse_json_mode_reply(self):
+        """Test a whitespace-padded JSON-mode reply parses without extraction"""
+        text = '\n  {"candidates": [], "next_actions": ["wait"]}\n'
+        self.assertEqual(
+            json_utils.parse_json_object(text),
+            {"candidates": [], "next_actions": ["wait"]}
+        )
+
+    def test_parse_fenced_object(self):
+        """Test a ```json fenced reply parses"""
+        text = '```json\n{"candidates": [{"symbol": "BTC"}]}\n```'
+        self.assertEqual(
+            json_utils.parse_json_object(text),
+            {"candidates": [{"symbol": "BTC"}]}
+        )
+
+    def test_parse_embedded_object(self):
+        """Test a JSON object surrounded by prose parses"""
+        text = 'Here is my plan:\n{"a": {"b": 1}}\nGood luck!'
+        self.assertEqual(json_utils.parse_json_object(text), {"a": {"b": 1}})
+
+    def test_no_object_raises(self):
+        """Test replies without braces raise ValueError"""
+        self.assertIsNone(json_utils.extract_json_object("no json here"))
+        with self.assertRaises(ValueError):
+            json_utils.parse_json_object("no json here")
+
+    def test_trailing_braces_fall_back_to_first_object(self):
+        """Test prose with braces after the object falls back to the balanced scan"""
+        text = 'Plan: {"a": "}{"} -- note: use {x} sizing'
+        self.assertEqual(json_utils.parse_json_object(text), {"a": "}{"})
+
+    def test_invalid_object_raises(self):
+        """Test malformed JSON raises ValueError"""
+        with self.assertRaises(ValueError):
+            json_utils.parse_json_object('{"a": }')
+
+
+class TestStreamingObjectScanner(unittest.TestCase):
+    """Test incremental extraction of streamed candidates"""
+
+    def test_emits_candidates_as_they_complete(self):
+        """Test each candidate is emitted once its closing brace arrives"""
+        text = (
+            '```json\n{"market_view": {"summary": "a {b} c"}, "candidates": ['
+            '{"symbol": "BTC", "entry": {"price": 1}}, '
+            '{"symbol": "ETH", "rationale": "quote \\" and }"}'
+            '], "next_actions": ["wait"]}\n```'
+        )
+        scanner = json_utils.StreamingObjectScanner()
+        emitted = []
+        for i in range(0, len(text), 7):
+            emitted.extend(scanner.feed(text[i:i + 7]))
+
+        self.assertEqual([c["symbol"] for c in emitted], ["BTC", "ETH"])
+        self.assertEqual(emitted[0]["entry"], {"price": 1})
+        self.assertEqual(scanner.text, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,3 +32,48 @@ def test_get_logger_singleton(tmp_path):
     logger2 = get_logger("singleton")
 
     assert logger1 is logger2
+
+
+def test_logger_is_enabled_for(tmp_path):
+    """Test level checks are delegated to the underlying logger."""
+    logger = Logger("level_logger", level="WARNING", log_file=str(tmp_path / "level.log"))
+
+    assert not logger.isEnabledFor(logging.INFO)
+    assert logger.isEnabledFor(logging.WARNING)
+
+
+def test_logger_trims_tracebacks(tmp_path):
+    """Test logged tracebacks keep only the innermost frames."""
+    log_file = tmp_path / "traceback.log"
+    logger = Logger("traceback_logger", log_file=str(log_file), traceback_limit=1)
+
+    def outer():
+        inner()
+
+    def inner():
+        raise ValueError("boom")
+
+    try:
+        outer()
+    except ValueError:
+        logger.exception("Failed")
+
+    log_content = log_file.read_text()
+    assert "ValueError: boom" in log_content
+    assert "in inner" in log_content
+    assert "in outer" not in log_content
+
+
+def test_queued_logger_drains_on_stop(tmp_path):
+    """Test queued records are written by the listener and flushed on stop."""
+    log_file = tmp_path / "queued.log"
+    logger = Logger("queued_logger", log_file=str(log_file), use_queue=True)
+
+    logger.info("Queued %s", "message")
+    logger.stop()
+    assert "Queued message" in log_file.read_text()
+
+    # After stopping, records are written synchronously
+    logger.info("Direct message")
+    assert "Direct message" in log_file.read_text()
+    logger.stop()
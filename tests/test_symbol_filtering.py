@@ -144,6 +144,43 @@ class TestSymbolFiltering(unittest.TestCase):
         self.assertEqual(market_data['BTC']['price'], 50000.0)
         self.assertEqual(market_data['ETH']['price'], 3000.0)
 
+    @patch('src.data.market_data.Info')
+    def test_get_all_mids_cached_reuses_snapshot(self, mock_info):
+        """Test get_all_mids_cached only hits the API once within the TTL"""
+        config = {'api_url': 'https://api.hyperliquid-testnet.xyz'}
+        collector = MarketDataCollector(config)
+        collector.info.all_mids = Mock(return_value={'BTC': 50000.0})
+
+        first = collector.get_all_mids_cached(ttl=60)
+        second = collector.get_all_mids_cached(ttl=60)
+
+        self.assertEqual(first, {'BTC': 50000.0})
+        self.assertIs(first, second)
+        self.assertEqual(collector.info.all_mids.call_count, 1)
+
+        # A zero TTL always refetches
+        collector.get_all_mids_cached(ttl=0)
+        self.assertEqual(collector.info.all_mids.call_count, 2)
+
+    @patch('src.data.market_data.Info')
+    def test_get_candles_bulk_keys_frames_by_coin(self, mock_info):
+        """Test get_candles_bulk issues one request per coin and maps results back"""
+        config = {'api_url': 'https://api.hyperliquid-testnet.xyz'}
+        collector = MarketDataCollector(config)
+        collector.info.candles_snapshot = Mock(
+            side_effect=lambda coin, interval, start, end: [
+                {'t': 0, 'o': 1, 'h': 2, 'l': 0.5, 'c': 1.5 if coin == 'BTC' else 2.5, 'v': 10}
+            ]
+        )
+
+        frames = collector.get_candles_bulk(['BTC', 'ETH'], '3m', 0, 1)
+        collector.close()
+
+        self.assertEqual(list(frames), ['BTC', 'ETH'])
+        self.assertEqual(frames['BTC']['close'].iloc[-1], 1.5)
+        self.assertEqual(frames['ETH']['close'].iloc[-1], 2.5)
+        self.assertEqual(collector.info.candles_snapshot.call_count, 2)
+
 
 class TestTradingPlanValidation(unittest.TestCase):
     """Test trading plan validation"""